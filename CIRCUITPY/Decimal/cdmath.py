@@ -19,6 +19,8 @@ import jepler_udecimal.utrig        # Needed for trig functions in Decimal
 import umath                        # my extensions
 from jepler_udecimal import Decimal, getcontext, localcontext, InvalidOperation
 
+_getcontext = getcontext
+
 pi = Decimal.pi
 
 _Zero = Decimal(0)
@@ -27,6 +29,7 @@ _Two = Decimal(2)
 _Ten = Decimal(10)
 _point1 = Decimal("0.1")
 _point5 = Decimal("0.5")
+_pi_half = pi * _point5
 
 # TODO: all that is in https://docs.python.org/3/library/cmath.html
 
@@ -38,354 +41,319 @@ _point5 = Decimal("0.5")
 class ComplexDecimal(object):
     """Floating point class for complex decimal arithmetic."""
     
-    __slots__ = ("real", "imag")
+    __slots__ = ("real", "imag", "_abs2")
     def __new__(cls, real="0", imag="0", context=None):
         self = object.__new__(cls)
+        self._abs2 = None
         if isinstance(real, complex):           # we also accept the standard complex notation a+bj
             self.real = Decimal(real.real)
             self.imag = Decimal(real.imag)
-        else:
-            self.real = Decimal(real)
-            self.imag = Decimal(imag)
+            return self
+        # Decimal(Decimal) would make a copy which we don't need - Decimals are immutable. 
+        self.real = real if type(real) is Decimal else Decimal(real)
+        self.imag = imag if type(imag) is Decimal else Decimal(imag)
         return self
         
 
+    @classmethod
+    def _fast(cls, real, imag):
+        # internal constructor without any checks or conversions. 
+        # real and imag must both be Decimals. 
+        self = object.__new__(cls)
+        self._abs2 = None
+        self.real = real
+        self.imag = imag
+        return self
+        
+
+    def _absq(self):
+        # |z|², computed on first use and then kept with the instance, since 
+        # division, abs, polar and ln all need it. 
+        v = self._abs2
+        if v is None:
+            v = self.real * self.real + self.imag * self.imag
+            self._abs2 = v
+        return v
+
+
     def __repr__(self):
         # strip trailing zeros. 
         return f'C({self.real.normalize()}, {self.imag.normalize()})'
 
 
     def _conjugate(self, context=None):
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
             
-        return ComplexDecimal(self.real, -self.imag)
+        return ComplexDecimal._fast(self.real, -self.imag)
         
     
+    # in the arithmetic dunders, self is always a ComplexDecimal (operator dispatch), 
+    # so only other needs to be coerced. 
     def __add__(self, other, context=None):
-        if context is None:
-            context = getcontext()
-
-        if isinstance(self, (int, float, complex)):           
-            self = ComplexDecimal(self)
-            
-        if isinstance(other, (int, float, complex)):
+        if type(other) is not ComplexDecimal:
             other = ComplexDecimal(other)
         
-        return ComplexDecimal(self.real + other.real, self.imag + other.imag)
+        return ComplexDecimal._fast(self.real + other.real, self.imag + other.imag)
                 
 
     def __sub__(self, other, context=None):
-        if context is None:
-            context = getcontext()
-
-        if isinstance(self, (int, float, complex)):           
-            self = ComplexDecimal(self)
-            
-        if isinstance(other, (int, float, complex)):
+        if type(other) is not ComplexDecimal:
             other = ComplexDecimal(other)
         
-        return ComplexDecimal(self.real - other.real, self.imag - other.imag)
+        return ComplexDecimal._fast(self.real - other.real, self.imag - other.imag)
 
 
     def __mul__(self, other, context=None):
-        if context is None:
-            context = getcontext()
-
-        if isinstance(self, (int, float, complex)):           
-            self = ComplexDecimal(self)
-            
-        if isinstance(other, (int, float, complex)):
+        if type(other) is not ComplexDecimal:
             other = ComplexDecimal(other)
         
         real_part = self.real * other.real - self.imag * other.imag
         imag_part = self.imag * other.real + self.real * other.imag
         
-        return ComplexDecimal(real_part, imag_part)
+        return ComplexDecimal._fast(real_part, imag_part)
         
 
     def __truediv__(self, other, context=None):
-        if context is None:
-            context = getcontext()
-
-        if isinstance(self, (int, float, complex)):           
-            self = ComplexDecimal(self)
-            
-        if isinstance(other, (int, float, complex)):
+        if type(other) is not ComplexDecimal:
             other = ComplexDecimal(other)
         
-        # we conjugate in pace ; other.imag must be taken with a negative sign
-        denominator = other.real * other.real + other.imag * other.imag
-        real_part = (self.real * other.real - self.imag * (- other.imag)) / denominator
-        imag_part = (self.imag * other.real + self.real * (- other.imag)) / denominator
+        # multiply by the conjugate of other, and divide only once by |other|².
+        inv = _One / other._absq()
+        real_part = (self.real * other.real + self.imag * other.imag) * inv
+        imag_part = (self.imag * other.real - self.real * other.imag) * inv
         
-        return ComplexDecimal(real_part, imag_part)
+        return ComplexDecimal._fast(real_part, imag_part)
 
 
     def polar(self, context=None):
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
             
-        r = self.abs()
-        if r == 0:
+        s = self._absq()
+        if s == 0:
+            # the context is only needed here, so we fetch it only here. 
+            if context is None:
+                context = _getcontext()
             return context._raise_error(InvalidOperation, "polar(z), |z| == 0")
 
-        return (r, self.phase())
+        return (s.sqrt(), Decimal.atan2(self.imag, self.real))
 
 
     def rect(self, other, context=None):
-        if context is None:
-            context = getcontext()
-    
         # (self, other) must be the tuple (r, theta) as returned by polar(). 
         # i.e. rect() needs to be called as rect(r, theta). 
         # TODO how do we check this? 
         real_part = self * other.cos()
         imag_part = self * other.sin()
         
-        return ComplexDecimal(real_part, imag_part)
+        return ComplexDecimal._fast(real_part, imag_part)
 
 
     def phase(self, context=None):
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
             
         return Decimal.atan2(self.imag, self.real)  
 
 
+    def _exp(self, context=None):
+        # e^(a+bi) = e^a * (cos(b) + i sin(b))
+        er = Decimal.exp(self.real)
+        return ComplexDecimal._fast(er * Decimal.cos(self.imag), er * Decimal.sin(self.imag))
+
+
     def __pow__(self, other, context=None):
-        if context is None:
-            context = getcontext()
+        # z^w = e^(w⋅log(z)), for real as well as complex exponents. 
+        if type(other) is not ComplexDecimal:
+            other = ComplexDecimal(other)
 
-        if isinstance(self, (int, float, complex)):           
-            self = ComplexDecimal(self)
-            
-        if isinstance(other, (int, float)):
-            other = Decimal(other)
-            (r, theta) = self.polar() 
-            r = r ** other          # context = Decimal
-            theta = theta * other
-            return ComplexDecimal.rect(r, theta)
-        else:
-            return NotImplemented       #   z^w = e^(w⋅log(z))   TODO 
+        return (other * self.ln(context))._exp(context)
 
     def sqrt(self, context=None):
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, (int, float, complex)):           
             self = ComplexDecimal(self)
         
-        return self ** 0.5
+        # https://en.wikipedia.org/wiki/Square_root#Algebraic_formula
+        # computed directly instead of self ** 0.5, which goes through polar() and rect(). 
+        # The larger of the two parts is taken from the sqrt, the other one by division, 
+        # so that we never subtract two nearly equal numbers. 
+        a = self.real
+        b = self.imag
+        if a == 0 and b == 0:
+            return ComplexDecimal._fast(_Zero, _Zero)
+        t = ((self.abs() + a.copy_abs()) * _point5).sqrt()
+        if a >= 0:
+            return ComplexDecimal._fast(t, b / (_Two * t))
+        else:
+            return ComplexDecimal._fast(b.copy_abs() / (_Two * t), t.copy_sign(b))
             
 
     def abs(self, context=None):
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
             
-        return Decimal.sqrt(self.real * self.real + self.imag * self.imag)
+        return Decimal.sqrt(self._absq())
     
 
     def sin(self, context=None):
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
             
-        real_part = Decimal.sin(self.real) * Decimal.cosh(self.imag)
-        imag_part = Decimal.cos(self.real) * Decimal.sinh(self.imag)
+        sh, ch = Decimal.sinh_cosh(self.imag)
+        real_part = Decimal.sin(self.real) * ch
+        imag_part = Decimal.cos(self.real) * sh
 
-        return ComplexDecimal(real_part, imag_part)
+        return ComplexDecimal._fast(real_part, imag_part)
             
 
     def cos(self, context=None):
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
             
-        real_part = Decimal.cos(self.real) * Decimal.cosh(self.imag)
-        imag_part = - Decimal.sin(self.real) * Decimal.sinh(self.imag)
+        sh, ch = Decimal.sinh_cosh(self.imag)
+        real_part = Decimal.cos(self.real) * ch
+        imag_part = - Decimal.sin(self.real) * sh
 
-        return ComplexDecimal(real_part, imag_part)
+        return ComplexDecimal._fast(real_part, imag_part)
 
         
     def tan(self, context=None):
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
             
-        return self.sin() / self.cos()
+        return self.sin(context) / self.cos(context)
 
 
     def asin(self, context=None):
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
 
         # https://de.wikipedia.org/wiki/Arkussinus_und_Arkuskosinus#Komplexe_Argumente
         a = self.real
         b = self.imag
-        real_part = _point5 * Decimal.acos(Decimal.sqrt((a*a + b*b - _One)**2 + 4*b*b) - (a*a + b*b)).copy_sign(a)
-        imag_part = _point5 * Decimal.acosh(Decimal.sqrt((a*a + b*b - _One)**2 + 4*b*b) + (a*a + b*b)).copy_sign(b)
+        bb = b*b
+        s = self._absq()
+        d = s - _One
+        w = Decimal.sqrt(d*d + 4*bb)
+        real_part = _point5 * Decimal.acos(w - s).copy_sign(a)
+        imag_part = _point5 * Decimal.acosh(w + s).copy_sign(b)
   
-        return ComplexDecimal(real_part, imag_part)
+        return ComplexDecimal._fast(real_part, imag_part)
 
 
     def acos(self, context=None):
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
 
         # https://de.wikipedia.org/wiki/Arkussinus_und_Arkuskosinus#Komplexe_Argumente
-        return ComplexDecimal(pi/_Two) - self.casin()
+        return ComplexDecimal._fast(_pi_half, _Zero) - self.asin(context)
 
 
     def atan(self, context=None):
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
 
         # https://de.wikipedia.org/wiki/Arkustangens_und_Arkuskotangens#Komplexer_Arkustangens_und_Arkuskotangens
         a = self.real
         b = self.imag
+        s = self._absq()
         if a != 0:
-            real_part = _point5 * ((a*a + b*b - _One) / ((_Two * a) + (pi/_Two)).atanh().copy_sign(a))
-        elif a == 0 and b.abs() <= 1:
+            real_part = _point5 * (((s - _One) / (_Two * a)).atan() + _pi_half.copy_sign(a))
+        elif a == 0 and b.copy_abs() <= 1:
             real_part = _Zero
         else:  # a == 0 and |b| > 1
-            real_part = (pi/_Two).copy_sign(b)
-        imag_part = _point5 * (_Two * b / (a*a + b*b + _One)).atanh()
+            real_part = _pi_half.copy_sign(b)
+        imag_part = _point5 * (_Two * b / (s + _One)).atanh()
   
-        return ComplexDecimal(real_part, imag_part)
+        return ComplexDecimal._fast(real_part, imag_part)
 
 
     def sinh(self, context=None):
         # https://de.wikipedia.org/wiki/Sinus_hyperbolicus_und_Kosinus_hyperbolicus#Komplexe_Argumente
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
 
-        real_part = Decimal.cos(self.imag) * Decimal.sinh(self.real)
-        imag_part = Decimal.sin(self.imag) * Decimal.cosh(self.real)
+        sh, ch = Decimal.sinh_cosh(self.real)
+        real_part = Decimal.cos(self.imag) * sh
+        imag_part = Decimal.sin(self.imag) * ch
 
-        return ComplexDecimal(real_part, imag_part)
+        return ComplexDecimal._fast(real_part, imag_part)
 
             
     def cosh(self, context=None):
         # https://de.wikipedia.org/wiki/Sinus_hyperbolicus_und_Kosinus_hyperbolicus#Komplexe_Argumente
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
 
-        real_part = Decimal.cos(self.imag) * Decimal.cosh(self.real)
-        imag_part = Decimal.sin(self.imag) * Decimal.sinh(self.real)
+        sh, ch = Decimal.sinh_cosh(self.real)
+        real_part = Decimal.cos(self.imag) * ch
+        imag_part = Decimal.sin(self.imag) * sh
        
-        return ComplexDecimal(real_part, imag_part)
+        return ComplexDecimal._fast(real_part, imag_part)
             
 
     def tanh(self, context=None):
         # https://de.wikipedia.org/wiki/Tangens_hyperbolicus_und_Kotangens_hyperbolicus#Numerische_Berechnung
         # see also: Bronstein, Taschenbuch der Mathematik, 1979, p.567
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
 
-        return self.sinh() / self.cosh()
+        return self.sinh(context) / self.cosh(context)
         
 
     # complex natural log. We return only the principle value. 
     def ln(self, context=None):
         # https://en.wikipedia.org/wiki/Complex_logarithm
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, (int, float, complex)):           
             self = ComplexDecimal(self)
         
-        r = self.abs()
-        if r == 0:
+        # ln|z| = ln(|z|²) / 2, which saves us the square root. 
+        s = self._absq()
+        if s == 0:
+            if context is None:
+                context = _getcontext()
             return context._raise_error(InvalidOperation, "ln(z), |z| == 0")
 
         arg = Decimal.atan2(self.imag, self.real)
 
-        return ComplexDecimal(r.ln(), arg)
+        return ComplexDecimal._fast(s.ln() * _point5, arg)
         
 
     def asinh(self, context=None):
         # https://de.wikipedia.org/wiki/Areasinus_hyperbolicus_und_Areakosinus_hyperbolicus#Numerische_Berechnung
         # see also: Bronstein, Taschenbuch der Mathematik, 1979, p.570
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
 
-        return(self + (self*self + _cdOne).sqrt()).ln()
+        return (self + (self*self + _cdOne).sqrt(context)).ln(context)
 
             
     def acosh(self, context=None):
         # https://de.wikipedia.org/wiki/Areasinus_hyperbolicus_und_Areakosinus_hyperbolicus#Numerische_Berechnung
         # see also: Bronstein, Taschenbuch der Mathematik, 1979, p.570
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
 
-        return (self + (self*self - _cdOne).sqrt()).ln()
+        return (self + (self*self - _cdOne).sqrt(context)).ln(context)
 
 
     def atanh(self, context=None):
         # https://de.wikipedia.org/wiki/Areatangens_hyperbolicus_und_Areakotangens_hyperbolicus
         # see also: Bronstein, Taschenbuch der Mathematik, 1979, p.570
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
 
-        return ((_cdOne + self) / (_cdOne - self)).ln() / 2
+        return ((_cdOne + self) / (_cdOne - self)).ln(context) * _point5
 
     
     def acoth(self, context=None):
         # https://de.wikipedia.org/wiki/Areatangens_hyperbolicus_und_Areakotangens_hyperbolicus
         # see also: Bronstein, Taschenbuch der Mathematik, 1979, p.570
-        if context is None:
-            context = getcontext()
-
         if isinstance(self, complex):           
             self = ComplexDecimal(self)
 
-        return ((self + _cdOne) / (self - _cdOne)).ln() / 2
+        return ((self + _cdOne) / (self - _cdOne)).ln(context) * _point5
         
         
 
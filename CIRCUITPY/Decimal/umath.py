@@ -13,17 +13,33 @@ Please see jepler_udecimal/utrig.py for more information.
 import jepler_udecimal.utrig           # Needed for trig functions in Decimal
 from jepler_udecimal import Decimal, localcontext, getcontext, InvalidOperation
 
-__all__ = ["sinh", "cosh", "tanh", "asinh", "acosh", "atanh", "atan2", "pi", "e", "as_integer_ratio"]
+_getcontext = getcontext
+
+__all__ = ["sinh", "cosh", "sinh_cosh", "tanh", "asinh", "acosh", "atanh", "atan2", "pi", "e", "as_integer_ratio"]
 
 _Zero = Decimal(0)
 _One = Decimal(1)
 _Two = Decimal(2)
 _Ten = Decimal(10)
 _point1 = Decimal("0.1")
+_point5 = Decimal("0.5")
+_point125 = Decimal("0.125")
 e = _One.exp()
 pi = Decimal(4) * _One.atan()
+_pi_half = pi * _point5
 D = Decimal
 
+# ln(10) is needed on every tanh() call. It is cached per precision 
+# so that it is recomputed only when getcontext().prec changes. 
+_ln10_cache = {}
+
+def _ln10(prec):
+    ln10 = _ln10_cache.get(prec)
+    if ln10 is None:
+        ln10 = _Ten.ln()
+        _ln10_cache[prec] = ln10
+    return ln10
+
 # TODO: all that is in https://docs.python.org/3/library/math.html, eg. 
 #  erf, erc, gamma, lgamma, comb, perm, cbrt, exp2, expm1?, log1p?, log2, hypot, degrees, radians, 
 
@@ -36,7 +52,7 @@ def sinh(x, context=None):
     """Compute the sinus hyperbolicus of the specified value"""
     # https://de.wikipedia.org/wiki/Sinus_hyperbolicus_und_Kosinus_hyperbolicus
     if context is None:
-        context = getcontext()
+        context = _getcontext()
 
     if not isinstance(x, Decimal):
         x = Decimal(x)
@@ -45,15 +61,14 @@ def sinh(x, context=None):
     if ans:
         return ans
 
-    y = -x
-    return (x.exp() - y.exp()) / _Two
+    return _sinh_raw(x)
 
 
 def cosh(x, context=None):
     """Compute the cosinus hyperbolicus of the specified value"""
     # https://de.wikipedia.org/wiki/Sinus_hyperbolicus_und_Kosinus_hyperbolicus
     if context is None:
-        context = getcontext()
+        context = _getcontext()
 
     if not isinstance(x, Decimal):
         x = Decimal(x)
@@ -62,15 +77,36 @@ def cosh(x, context=None):
     if ans:
         return ans
 
-    y = -x
-    return (x.exp() + y.exp()) / _Two
+    return _cosh_raw(x)
+
+
+# The _raw variants skip the type conversion and NaN checks. They are meant for 
+# arguments that are already known to be valid Decimals, e.g. the real and imag 
+# parts of a ComplexDecimal or values that were checked by the caller. 
+
+def _sinh_raw(x):
+    ex = x.exp()
+    return (ex - _One / ex) * _point5
+
+
+def _cosh_raw(x):
+    ex = x.exp()
+    return (ex + _One / ex) * _point5
+
+
+def sinh_cosh(x):
+    # sinh(x) and cosh(x) of the same argument with a single exp(). 
+    # Used by the complex functions in cdmath.py which always need both, as Decimal.sinh_cosh(). 
+    ex = x.exp()
+    inv = _One / ex
+    return ((ex - inv) * _point5, (ex + inv) * _point5)
 
 
 def tanh(x, context=None):
     """Compute the tangens hyperbolicus of the specified value"""
     # https://de.wikipedia.org/wiki/Tangens_hyperbolicus_und_Kotangens_hyperbolicus      
     if context is None:
-        context = getcontext()
+        context = _getcontext()
 
     if not isinstance(x, Decimal):
         x = Decimal(x)
@@ -80,24 +116,26 @@ def tanh(x, context=None):
         return ans
 
     with localcontext(context) as ctx:
-        n = getcontext().prec
+        n = ctx.prec
         
-        r = Decimal(n) * _Ten.ln() / _Two
+        r = Decimal(n) * _ln10(n) * _point5
         if x > r:
             return _One
         elif x < - r:
             return - _One
         elif x > -_point1 and x < _point1:
-            return x.sinh() / (x.exp() - x.sinh())
+            sh = _sinh_raw(x)
+            return sh / (x.exp() - sh)
         else:
-            return x.sinh() / x.cosh()
+            sh, ch = sinh_cosh(x)
+            return sh / ch
 
 
 def asinh(x, context=None):
     """Compute the area sinus hyperbolicus of the specified value"""
     # https://de.wikipedia.org/wiki/Areasinus_hyperbolicus_und_Areakosinus_hyperbolicus      
     if context is None:
-        context = getcontext()
+        context = _getcontext()
 
     if not isinstance(x, Decimal):
         x = Decimal(x)
@@ -114,27 +152,36 @@ def asinh(x, context=None):
         return -asinh(-x)
     if x > 10**(n/2):
         return _Two.ln() + x.ln()
-    elif x < Decimal(0.125):                        # let's do some Taylor
+    elif x < _point125:                        # let's do some Taylor
         # https://de.wikipedia.org/wiki/Areasinus_hyperbolicus_und_Areakosinus_hyperbolicus#Reihenentwicklungen
         result = x
-        a = Decimal(1)
-        # TODO don't have a fixed number of summands but stop when the summand is smaller than 10**(-prec)
+        x2 = x*x
+        xpow = x
+        # the coefficients are kept as a fraction of two small ints, so that there is 
+        # only one Decimal division per summand. 
+        num = 1
+        den = 1
+        # stop as soon as the summand drops below the last significant digit of the result. 
+        limit = x.adjusted() - n
         for i in range (3, n + 3, 2):  
-            j = Decimal(i)  
             # result = x * ( 1 - 1/2 * x^2/3 + 1/2 * 3/4 * x^4/5 ... 
-            x *= x*x                                # x^3, x^5, x^7, ... 
-            a *= -(j - _Two)/((j - _One)*j)         # -1/2 * 1/3, + 1/2 * 3/4 *1/5, -1/2 * 3/4 * 5/6 * 1/7, ... 
-            result += a * x 
+            xpow *= x2                              # x^3, x^5, x^7, ... 
+            num *= -(i - 2)                         # -1/2, + 1/2 * 3/4, -1/2 * 3/4 * 5/6, ... 
+            den *= i - 1
+            delta = Decimal(num) / Decimal(den * i) * xpow
+            result += delta 
+            if delta.adjusted() < limit:
+                break
         return result
     else:
-        return (x + (x**x + _One).sqrt()).ln()
+        return (x + (x*x + _One).sqrt()).ln()
             
 
 def acosh(x, context=None):
     """Compute the area cosinus hyperbolicus of the specified value"""
     # https://de.wikipedia.org/wiki/Areasinus_hyperbolicus_und_Areakosinus_hyperbolicus      
     if context is None:
-        context = getcontext()
+        context = _getcontext()
 
     if not isinstance(x, Decimal):
         x = Decimal(x)
@@ -143,7 +190,7 @@ def acosh(x, context=None):
     if ans:
         return ans
 
-    if x.compare_total_mag(Decimal(1)) < 0:
+    if x.compare_total_mag(_One) < 0:
         return context._raise_error(InvalidOperation, "acosh(x), x < 1")
 
     n = context.prec                #   TODO 
@@ -151,14 +198,14 @@ def acosh(x, context=None):
     if x > 10**(n/2):
         return _Two.ln() + x.ln() 
     else:
-        return (x + (x**x - 1).sqrt()).ln()
+        return (x + (x*x - _One).sqrt()).ln()
 
 
 def atanh(x, context=None):
     """Compute the area tangens hyperbolicus of the specified value"""
     # https://de.wikipedia.org/wiki/Areatangens_hyperbolicus_und_Areakotangens_hyperbolicus
     if context is None:
-        context = getcontext()
+        context = _getcontext()
 
     if not isinstance(x, Decimal):
         x = Decimal(x)
@@ -168,17 +215,17 @@ def atanh(x, context=None):
         return ans
 
     # atanh is not defined for |x| > 1
-    if x.compare_total_mag(Decimal(1)) >= 0:
+    if x.compare_total_mag(_One) >= 0:
         return context._raise_error(InvalidOperation, "atanh(x), |x| > 1")
         
-    return ((1 + x)/(1 - x)).ln() / _Two
+    return ((_One + x)/(_One - x)).ln() * _point5
 
 
 def atan2(y, x, context=None):
     # Note: this is atan2(y, x) and thus follows the Fortran convention. 
     # https://en.wikipedia.org/wiki/Atan2, see Notes
     if context is None:
-        context = getcontext()
+        context = _getcontext()
 
     if not isinstance(x, Decimal):
         x = Decimal(x)
@@ -201,9 +248,9 @@ def atan2(y, x, context=None):
     elif x < 0 and y < 0:
         return (y/x).atan() - pi
     elif x == 0 and y > 0:
-        return pi/_Two
+        return _pi_half
     elif x == 0 and y < 0:
-        return - pi/_Two
+        return - _pi_half
     else:    #  x == 0 and y == 0
         return context._raise_error(InvalidOperation, "atan2(y, x), x == 0 and y == 0")
 
@@ -223,9 +270,6 @@ def as_integer_ratio(self, context=None):
     (0, 1)
 
     """
-    if context is None:
-        context = getcontext()
-
     if not isinstance(self, Decimal):
         self = Decimal(self)
 
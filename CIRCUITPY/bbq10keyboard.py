@@ -125,6 +125,23 @@ class BBQ10Keyboard:
 
         return self._buffer[0]
 
+    @property
+    def interrupt_status(self):
+        with self._i2c as i2c:
+            self._buffer[0] = _REG_INT
+            i2c.write(self._buffer, end=1)
+            i2c.readinto(self._buffer, end=1)
+
+        return self._buffer[0]
+
+    # the INT line stays asserted until the status is written back as 0. 
+    @interrupt_status.setter
+    def interrupt_status(self, val):
+        with self._i2c as i2c:
+            self._buffer[0] = _REG_INT | _WRITE_MASK
+            self._buffer[1] = val
+            i2c.write(self._buffer, end=2)
+
     @property
     def key_count(self):
         return self.status & KEY_COUNT_MASK
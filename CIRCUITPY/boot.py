@@ -20,8 +20,12 @@ import analogio
 # switch.direction = digitalio.Direction.INPUT
 # switch.pull = digitalio.Pull.UP
 
+# The USB voltage is read on every boot on purpose. Caching the result, e.g. in NVM, would 
+# remount the flash R/W with the cable plugged in after a boot on battery, and then the 
+# host and we both write to the filesystem. A single ADC read costs a few microseconds. 
 usbpin = analogio.AnalogIn(board.A2)
 v = usbpin.value
+usbpin.deinit()
 if v < 35000: 
     storage.remount("/", readonly=False)
     print ("usbpin = {} - Flash remounted R/W".format(v))
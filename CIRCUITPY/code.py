@@ -5,7 +5,7 @@
 
 from os import uname
 from gc import mem_free, collect
-from re import sub
+import re
 from supervisor import runtime
 # import sys
 import adafruit_ili9341
@@ -26,45 +26,36 @@ import time
 from keymap import *
 # math functions wrapper
 from umath import *        # all these wrapper functions
-# for plotting: 
+# ulab is loaded by umath anyway, and np is also meant for the user's expressions. 
+# bitmaptools is imported in plot(), label only for building the status line. 
 import ulab.numpy as np
-from adafruit_display_text import label
-import bitmaptools as bt
 
 dsp = displayio   # convenience
 
 # we need to tell Teensy + Adapter from "real" Feathers... 
 (sysname, nodename, release, version, machine) = uname()
-if "Teensy" in machine: 
-    # A0 = board.A14  # ??? 
-    A1 = board.A1
-    A2 = board.A3
-    A3 = board.A2
-    A4 = board.A0
-    A5 = board.A6
-    D13 = board.D5
-    D12 = board.D6
-    D11 = board.D9
-    D10 = board.D10
-    D9 = board.D4
-    D6 = board.D3
-    D5 = board.D8
-    VOLTAGE_MONITOR = board.A7
-else: 
-    A0 = board.A0
-    A1 = board.A1
-    A2 = board.A2
-    A3 = board.A3
-    A4 = board.A4
-    A5 = board.A5
-    D13 = board.D13
-    D12 = board.D12
-    D11 = board.D11
-    D10 = board.D10
-    D9 = board.D9
-    D6 = board.D6
-    D5 = board.D5
-    VOLTAGE_MONITOR = board.VOLTAGE_MONITOR
+# our pin names (those of the Feather M4) -> board pin names. 
+PINS_FEATHER = {p: p for p in ("A0", "A1", "A2", "A3", "A4", "A5", "D13", "D12", "D11", 
+                               "D10", "D9", "D6", "D5", "VOLTAGE_MONITOR")}
+PINS_TEENSY = {
+    # "A0": "A14",  # ??? 
+    "A1": "A1",
+    "A2": "A3",
+    "A3": "A2",
+    "A4": "A0",
+    "A5": "A6",
+    "D13": "D5",
+    "D12": "D6",
+    "D11": "D9",
+    "D10": "D10",
+    "D9": "D4",
+    "D6": "D3",
+    "D5": "D8",
+    "VOLTAGE_MONITOR": "A7",
+}
+pins = PINS_TEENSY if "Teensy" in machine else PINS_FEATHER
+globals().update({name: getattr(board, pin) for name, pin in pins.items()})
+del PINS_FEATHER, PINS_TEENSY, pins
 
 
 # playing with Teensy... 
@@ -117,6 +108,15 @@ kbd = BBQ10Keyboard(i2c)
 time.sleep(0.1)
 kbd.backlight = 0.2
 # kbd.report_mods = True
+# the keyboard's interrupt line (active low), if it is wired to a Feather pin. Reading a pin 
+# costs no I2C transaction, unlike kbd.key_count. Leave at None to poll the keyboard. 
+KBD_INT = None          # e.g. D12, depending on the solder jumpers of the wing
+kbd_int = None
+if KBD_INT is not None:
+    import digitalio
+    kbd_int = digitalio.DigitalInOut(KBD_INT)
+    kbd_int.pull = digitalio.Pull.UP
+    kbd.interrupt_status = 0
 tsc = tsc2004.TSC2004(i2c)
 
 # initialize RTC only if it is connected. 
@@ -126,16 +126,56 @@ if 0x68 in i2cdevices:
     # TODO set system RTC and unload PCF8523. 
 
 
+class Ring:
+    '''
+    fixed size buffer for the command history. append() overwrites the oldest 
+    entry once the buffer is full, so it never allocates. 
+    '''
+    __slots__ = ("buf", "head", "n")
+
+    def __init__(self, cap):
+        self.buf = [None] * cap
+        self.head = 0           # next slot to write
+        self.n = 0              # number of entries
+
+    def __len__(self):
+        return self.n
+
+    def append(self, x):
+        buf = self.buf
+        buf[self.head] = x
+        self.head = (self.head + 1) % len(buf)
+        if self.n < len(buf):
+            self.n += 1
+
+    def get(self, i):
+        '''
+        returns entry i, where -1 is the youngest one, like in list indexing. 
+        '''
+        return self.buf[(self.head + i) % len(self.buf)]
+
+    def __iter__(self):
+        # oldest to youngest
+        cap = len(self.buf)
+        for i in range(self.head - self.n, self.head):
+            yield self.buf[i % cap]
+
+
 ps1 = ">>> "     # this should be sys.ps1 but it seems not available. 
 ps2 = "... "
 prompt = ps1
-command = []        # let's use a list here. Easier for insert and delete 
+CMDMAX = 128
+command = bytearray(CMDMAX)     # the edit line, preallocated, so that it never grows or moves
+cmdlen = 0
 cursor = 0
 mod_sym = 0
 historyfile = "/history.txt" 
-historylist = []
+HISTMAX = 100
+historylist = Ring(HISTMAX)
 historyptr = 0
-oldcommand = ""
+oldcommand = b""
+histbuf = []        # commands not yet written to the history file
+HISTFLUSH = 10      # write them at the latest after this many commands
 ans = ""            # Casio-like ANS string
 in_compound_statement = False
 compound_statement = ""
@@ -145,9 +185,18 @@ batpin = analogio.AnalogIn(VOLTAGE_MONITOR)
 FULL = 2
 WARN = 1
 EMPTY = 0
+BAT_COLORS = (RED, YELLOW, OFF)     # Neopixel color, indexed by EMPTY, WARN, FULL
 batstat = FULL
+# battery ADC calibration. BAT is connected via a ~50% resistor divider. 
+BAT_MAX = 37321     # 4.2V = 100%. strange that RP2040 and M4 have different values. 
+BAT_MIN = 30212     # 3.4V = 0%, proportional von 4.2 
+BAT_SPAN = BAT_MAX - BAT_MIN
+batavg = batpin.value   # smoothed battery reading, see update_status()
+LOW_MEM = 8192      # bytes. Below this, a finished command runs the garbage collector. 
+last_status = ""
 
 myfont = terminalio.FONT
+fontx, fonty = myfont.get_bounding_box()
 
 # useful terminalio escape sequences
 clear_display = '\033[2J'
@@ -155,46 +204,113 @@ ceol = '\033[K'    # clear to end of line
 move_cursor_left = '\033[1D'
 
 
-def stifle(lst, n):
+def history(cmd):
     '''
-    shortens a list to the last n entries. The top ones are discarded. 
+    appends the last command to the historylist and buffers it for the history file. 
     '''
-    if len(lst) <= n:
-        return lst
-    else:
-        return lst[-n:]
+    if cmd == '':                        # if the cmd is empty, do nothing.  
+        return
+    histbuf.append("{}\r\n".format(cmd))
+    if len(histbuf) >= HISTFLUSH:
+        history_flush()
+    # print ("history: cmd {} is {}".format(cmd,type(cmd)))
+    historylist.append(cmd.encode())    # stored as bytes, so that KEY_UP can copy it straight into command
 
 
-def history(cmd, hlist):
+def history_flush():
     '''
-    appends the last command to the historylist and writes it to the history file. 
+    appends the buffered commands to the history file in one write. 
+    Called from the idle loop, so that the SD card is not written on every Enter. 
     '''
-    if cmd == '':                        # if the cmd is empty, do nothing.  
-        return hlist
+    if not histbuf:
+        return
     try:
         # appending works only when the USB cable is not attached. 
         with open(historyfile, "a") as file:
-            file.write("{}\r\n".format(cmd))
-            file.flush()
+            file.write("".join(histbuf))
     except OSError as e:
         # for example if none is available. Maybe we should inform the user. 
         # tprint ("\r\n{}\r\n".format(e)) 
         pass
-    # print ("history: cmd {} is {}".format(cmd,type(cmd)))
-    hlist.append(cmd)
-    hlist = stifle(hlist, 100)
-    return hlist
+    histbuf.clear()
+
+
+def cmd_str():
+    '''
+    returns the edit line as a string. 
+    '''
+    return str(command[:cmdlen], "ascii")
+
+
+def cmd_set(s):
+    '''
+    replaces the edit line by the str or bytes s and puts the cursor at its end. 
+    '''
+    global cmdlen, cursor
+    if isinstance(s, str):
+        s = s.encode()
+    n = len(s)
+    if n > CMDMAX:
+        n = CMDMAX
+        s = s[:n]
+    command[0:n] = s                    # memcpy, no intermediate copy of s
+    cmdlen = cursor = n
+
+
+def cmd_insert(s):
+    '''
+    inserts the str s at the cursor position, as long as it fits. 
+    '''
+    global cmdlen, cursor
+    n = len(s)
+    if cmdlen + n > CMDMAX:
+        return
+    # shift the tail right. The source is copied first, since MicroPython does not promise 
+    # memmove semantics for a slice store between overlapping parts of the same buffer. 
+    command[cursor+n:cmdlen+n] = command[cursor:cmdlen]
+    if n == 1:
+        command[cursor] = ord(s)        # the usual case, a single key
+    else:
+        command[cursor:cursor+n] = s.encode()
+    cmdlen += n
+    cursor += n
+
+
+def cmd_delete():
+    '''
+    deletes the character in front of the cursor. 
+    '''
+    global cmdlen, cursor
+    cursor -= 1
+    command[cursor:cmdlen-1] = command[cursor+1:cmdlen]     # copy of the tail, see cmd_insert()
+    cmdlen -= 1
+
+
+# statement keywords, see is_statement() and is_compound_statement()
+KEYWORDS = ("for", "while", "if", "try")
 
 
-def is_statement(cmd):
+def starts_with_keyword(cmd):
+    '''
+    checks if cmd begins with one of the KEYWORDS as a whole word, 
+    so that e.g. format(...) or iffy = 1 are not taken for a for or if statement. 
+    '''
+    for keyword in KEYWORDS:
+        if cmd.startswith(keyword):
+            n = len(keyword)
+            return len(cmd) == n or cmd[n] in " (:"
+    return False
+
+
+def is_statement(cmd, keyword):
     # https://docs.python.org/3/reference/compound_stmts.html 
     # check if cmd begins with one of these keywords: 
     # this is for simple single-line statements like
     # for i in range(10): print("sqr({}) = {}".format(i, i*i)) 
     # create value tables and such.  
     # statement must end with an empty line. The ... prompt is required here too. 
-    keywords = ("for", "while", "if", "try")
-    if any(cmd.startswith(keyword) for keyword in keywords):
+    # keyword is starts_with_keyword(cmd), which process() has computed already. 
+    if keyword:
         return True    
     # or if it is a variable assignment
     if "=" in cmd:
@@ -204,8 +320,7 @@ def is_statement(cmd):
 
 
 def is_compound_statement(cmd):
-    keywords = ("for", "while", "if", "try")
-    if any(cmd.startswith(keyword) for keyword in keywords) and cmd.endswith(":"):
+    if cmd.endswith(":") and starts_with_keyword(cmd):
         return True    
     # in this case we can potentially run true multiline statements with the "..." prompt. 
     # like in real Python, and empty line ends the statement. 
@@ -221,9 +336,70 @@ def is_compound_statement(cmd):
     # this way, we can also execute short programs residing on the SD card, like a solution library. 
     
 
-def replace_stmt(match):
-    string = match.group(0)
-    return 'l{}'.format(string)
+# fast path in process() for a bare number or one of these functions applied to a number. 
+FAST_FUNCS = ("sin", "cos", "tan", "asin", "acos", "atan", "sinh", "cosh", "tanh", 
+              "asinh", "acosh", "atanh", "exp", "log", "ln", "log10", "lg", "log2", 
+              "sqrt", "deg", "degrees", "rad", "radians", "gamma", "fact", "factorial")
+call_re = re.compile(r'^(\w+)\(([^()]*)\)$')
+
+
+def number(s):
+    '''
+    returns s as int or float, or raises ValueError. 
+    '''
+    try:
+        return int(s)
+    except ValueError:
+        return float(s)
+
+
+def fast_eval(cmd):
+    '''
+    evaluates cmd without the compiler if it is a number or a call like sin(0.5). 
+    Returns None if cmd is anything else. 
+    '''
+    try:
+        return number(cmd)
+    except ValueError:
+        pass
+    match = call_re.match(cmd)
+    if match is None or match.group(1) not in FAST_FUNCS:
+        return None
+    try:
+        x = number(match.group(2))
+    except ValueError:
+        return None
+    # look the function up now, the user may have redefined it. 
+    return globals()[match.group(1)](x)
+
+
+# compiled commands, so that a command recalled from the history is not parsed again. 
+CODE_CACHE_MAX = 32
+code_cache = {}
+code_order = []     # cache keys, least recently used first. MicroPython dicts keep no order. 
+
+
+def compiled(cmd, mode):
+    '''
+    returns the code object for cmd, mode being "exec" or "eval". 
+    Without compile() in the firmware, cmd is returned as is. 
+    '''
+    key = (cmd, mode)
+    code = code_cache.get(key)
+    if code is not None:
+        if code_order[-1] != key:       # move it to the end, unless it is there already
+            code_order.remove(key)
+            code_order.append(key)
+        return code
+    try:
+        code = compile(cmd, "<calc>", mode)
+    except NameError:
+        return cmd
+    if len(code_order) >= CODE_CACHE_MAX:
+        del code_cache[code_order.pop(0)]
+    code_cache[key] = code
+    code_order.append(key)
+    return code
 
 
 def process(cmd):
@@ -239,18 +415,22 @@ def process(cmd):
     # TODO if Teensy, switch to 600 MHz
 
     try:
-        if is_compound_statement(cmd):
+        result = fast_eval(cmd)
+        if result is not None:
+            return result
+        keyword = starts_with_keyword(cmd)      # the prefix test runs once per command
+        if keyword and cmd.endswith(":"):       # is_compound_statement(cmd)
             # print ("process: exec cmpnd cmd = {}".format(cmd))
-            cmd = sub(r'print', replace_stmt, cmd)
-            exec(cmd)
+            cmd = cmd.replace("print", "lprint")    # print to the screen, not to the serial console
+            exec(compiled(cmd, "exec"))
             return None
-        if is_statement(cmd):
+        if is_statement(cmd, keyword):
             # print ("process: exec cmd = {}".format(cmd))
-            exec(cmd)   
+            exec(compiled(cmd, "exec"))
             return None
         else:
             # print ("process: eval cmd = {}".format(cmd))
-            result = eval(cmd)
+            result = eval(compiled(cmd, "eval"))
             return result
     # since we don't know which exceptions are due, we just catch them all. 
     except Exception as e:
@@ -266,26 +446,31 @@ def lprint(line):
 
     
 def update_status(status):
-    collect()
-    mmax = 37321 # 4.2V                     # strange that RP2040 and M4 have different values. 
-    mmin = 30212 # 3.4V proportional von 4.2 
-    bat = 100 * (batpin.value - mmin) / (mmax - mmin)   # percentage. 3.4V = 0%, 4.2V = 100%. BAT is connected via a ~50% resistor divider.
-    bat = bat if bat <= 100.0 else 100.0        # clamp to 100
-    free = mem_free() // 1024
+    global batstat, batavg, last_status
+    free = mem_free()
+    # moving average (alpha = 32/256) so that a single noisy reading does not flip the Neopixel. 
+    batavg = (32 * batpin.value + 224 * batavg) >> 8
+    bat10 = 1000 * (batavg - BAT_MIN) // BAT_SPAN     # percentage * 10
+    bat10 = 0 if bat10 < 0 else 1000 if bat10 > 1000 else bat10     # clamp to 0 .. 100%
     time = date()
-    status.text = f"{free}K free    {bat:.1f}%    {time} "
+    text = f"{free // 1024}K free    {bat10 // 10}.{bat10 % 10}%    {time} "
+    # relayouting the label is expensive, so only touch it if something changed. 
+    if text != last_status:
+        status.text = text
+        last_status = text
     # set Neopixel according to bat status. 
-    # with a small 2% hysteresis
-    if bat < 10 and batstat != EMPTY:
-        batstat = EMPTY
-        pixels[0] = RED
-    elif 12 < bat < 20 and batstat != WARN:
-        batstat = WARN
-        pixels[0] = YELLOW
-    else: # if bat > 22 and batstat != FULL:
-        batstat = FULL
-        pixels[0] = OFF
-
+    # with a small 2% hysteresis: in between the ranges, the state stays as it is. 
+    if bat10 < 100:
+        new = EMPTY
+    elif 120 < bat10 < 200:
+        new = WARN
+    elif bat10 > 220:
+        new = FULL
+    else:
+        new = batstat
+    if new != batstat:
+        batstat = new
+        pixels[0] = BAT_COLORS[new]
 
 
 def date(d=None):
@@ -311,24 +496,33 @@ def inv(c):
 
 palette = displayio.Palette(8)
 palette[0] = 0x000000 # black / background
-palette[1] = 0xFF0000 # red
+palette[1] = 0xFFFFFF # white / foreground, also used by the terminal
 palette[2] = 0x00FF00 # green
 palette[3] = 0x0000FF # blue
 palette[4] = 0xFFFF00 # yellow
 palette[5] = 0x00FFFF # cyan
 palette[6] = 0xFF00FF # purple
-palette[7] = 0xFFFFFF # white
-fontcolor = palette[7]
+palette[7] = 0xFF0000 # red
+fontcolor = palette[1]
 bgcolor = palette[0]
 
 f = lambda x: x**2
 
+def plot_fn(expr):
+    '''
+    turns an expression in x into a function for plot(). The ulab functions are bound as 
+    default arguments, so that they are looked up as locals rather than as globals per call. 
+    '''
+    return eval("lambda x, sin=np.sin, cos=np.cos, tan=np.tan, exp=np.exp, log=np.log, sqrt=np.sqrt: " + expr)
+
+
 def plot(f, xmin, xmax, ymin=None, ymax=None, xlog=False, ylog=False, steps=100, grid=False, xticks=6, yticks=4):
     ''' Usage example:
         f = lambda x: x**2 - 2*x -2
         plot(f,-3, 3, grid=True)
+        plot("sin(x) + cos(x)", 0, 10)
         
-        f:              callable function
+        f:              callable function, or an expression in x as a string (see plot_fn)
         xmin, xmax:     left / right x limits
         ymin, ymax:     upper / lower y limits (image may be cropped)
         xlog:           plot x logarithmically (default False)
@@ -339,18 +533,23 @@ def plot(f, xmin, xmax, ymin=None, ymax=None, xlog=False, ylog=False, steps=100,
         yticks:         number of y ticks (default 4 for linear)
     '''
         
-    if (not callable(f)):
-        raise TypeError ("first argument must be a callable function")
+    import bitmaptools as bt    # loaded on the first plot only
 
-    # plot x log if xlog is True
-    x = np.linspace (xmin, xmax, steps) if xlog is False else np.logspace (xmin, xmax, steps)
+    if isinstance(f, str):
+        f = plot_fn(f)
+    if not callable(f):
+        raise TypeError ("first argument must be a callable function or an expression")
+
+    # plot x log if xlog is set
+    x = np.logspace (xmin, xmax, steps) if xlog else np.linspace (xmin, xmax, steps)
     # print ("x: {}".format(x))
     
     y = f(x)
+    del x                       # not needed any more, the screen x positions are equidistant
     # print ("y: {}".format(y))
     
-    # plot y log if ylog is True
-    y = np.log(y) if ylog is True else y 
+    # plot y log if ylog is set. Rebinding y lets the linear array be collected. 
+    y = np.log(y) if ylog else y 
 
     ymin = np.min(y) if ymin is None else ymin
     ymax = np.max(y) if ymax is None else ymax
@@ -363,8 +562,6 @@ def plot(f, xmin, xmax, ymin=None, ymax=None, xlog=False, ylog=False, steps=100,
     plotgroup = displayio.Group()
 
     # panel layout
-    font = terminalio.FONT
-    fontx, fonty = font.get_bounding_box()
     axismargin = fonty + 2
     bmpw = display.width - axismargin        # leave 2 pixels extra
     bmph = display.height - axismargin 
@@ -387,13 +584,15 @@ def plot(f, xmin, xmax, ymin=None, ymax=None, xlog=False, ylog=False, steps=100,
     x1 = 2
     x2 = bmpw-1
     y1 = y2 = bmph-3
-    bt.draw_line(bmp, x1, y1, x2, y2, 7) 
-    # x ticks
+    bt.draw_line(bmp, x1, y1, x2, y2, 1) 
+    # x ticks, rounded to the nearest pixel in integer arithmetic
+    xspan = x2 - x1
+    xdiv = max(xticks - 1, 1)
+    yt1 = bmph-1
+    yt2 = 0 if grid else bmph-3
     for i in range(xticks):
-        xt1 = xt2 = round(x1 + bmpw * i / (xticks-1))
-        yt1 = bmph-1
-        yt2 = 0 if grid is True else bmph-3
-        bt.draw_line(bmp, xt1, yt1, xt2, yt2, 7)
+        xt = x1 + (xspan * i + xdiv // 2) // xdiv
+        bt.draw_line(bmp, xt, yt1, xt, yt2, 1)
         # axis labeling:
         # one label per tick, centered at xi, axismargin/2, 3 sign. digits. 
         # determine tick positions automatically, pick "round" decimals like 0.1,1,10, and possibly halves. 
@@ -402,31 +601,34 @@ def plot(f, xmin, xmax, ymin=None, ymax=None, xlog=False, ylog=False, steps=100,
     x1 = x2 = 2
     y1 = bmph-2
     y2 = 0
-    bt.draw_line(bmp, x1, y1, x2, y2, 7) 
-    # x ticks
+    bt.draw_line(bmp, x1, y1, x2, y2, 1) 
+    # y ticks
+    yspan = y1 - 1
+    ydiv = max(yticks - 1, 1)
+    xt1 = 0 
+    xt2 = bmpw-1 if grid else 2
     for i in range(yticks):
-        xt1 = 0 
-        xt2 = bmpw-1 if grid is True else 2
-        yt1 = yt2 = round(y1 - 1 - bmph * i / (yticks-1))
-        bt.draw_line(bmp, xt1, yt1, xt2, yt2, 7)
-
-
-
-
-
+        yt = yspan - (yspan * i + ydiv // 2) // ydiv
+        bt.draw_line(bmp, xt1, yt, xt2, yt, 1)
 
-    display.root_group = plotgroup
-    
     # here starts the function plotting proper
     
     try:
-        for i in range (steps):   # to prevent overflow
-            pass
-
-
-
-            # plane.add_plot_line(x[i], y[i])
-            # time.sleep(0.1)
+        # map all data points to pixel coordinates at once in ulab. The x values are 
+        # equidistant on screen, also for xlog. y is clipped to the bitmap, i.e. cropped. 
+        if ymax == ymin:
+            ymax = ymin + 1
+        xpix = np.array(np.linspace(2, bmpw-1, steps) + 0.5, dtype=np.int16)
+        # in-place operators, so that the scaling needs only one temporary array
+        ypix = y - ymin
+        ypix *= -(bmph - 3) / (ymax - ymin)
+        ypix += bmph - 3 + 0.5         # + 0.5 rounds to the nearest pixel
+        ypix = np.array(np.clip(ypix, 0.5, bmph - 0.5), dtype=np.int16)
+        for i in range (steps-1):
+            bt.draw_line(bmp, int(xpix[i]), int(ypix[i]), int(xpix[i+1]), int(ypix[i+1]), 4)
+        # show the plot only once it is complete, so that the panel is sent over SPI once
+        # rather than once for the frame and again while the curve is being drawn.
+        display.root_group = plotgroup
     except Exception as e:
         display.root_group=root
         tprint ("\r\nError: {}\r\n".format(e))    
@@ -443,10 +645,6 @@ root = displayio.Group()
 
 # the main terminal window
 term = displayio.Group()
-fontx, fonty = myfont.get_bounding_box()
-term_palette = displayio.Palette(2)
-term_palette[0] = 0x000000
-term_palette[1] = 0xffffff
 termbox = displayio.TileGrid(myfont.bitmap, 
                              x=0, 
                              y=fonty, 
@@ -454,7 +652,7 @@ termbox = displayio.TileGrid(myfont.bitmap,
                              height=(display.height-fonty) // fonty,
                              tile_width=fontx,
                              tile_height=fonty,
-                             pixel_shader=term_palette)
+                             pixel_shader=palette)      # the 1 bit font uses entries 0 and 1
 term.append(termbox)
 myterm = terminalio.Terminal(termbox, myfont)
 root.append(term)
@@ -475,7 +673,9 @@ root.append(logo)
 # status line
 text = "Hello World!" + " "*38
 color = 0xFFFFFF
+from adafruit_display_text import label
 status = label.Label(myfont, text=text, color=color)
+del label           # only the status line object is needed from here on
 status.anchor_point = (0,0)
 status.anchored_position = (2 * sprite.width, 0)
 root.append(status)
@@ -484,12 +684,14 @@ display.root_group = root
 
 # open on-disk history file and feed it into the historylist
 try:
-    with open(historyfile, "r") as file:
-        historylist = [line.rstrip() for line in file] # remove line breaks
-        historylist = stifle(historylist, 100) 
-    # write back shortened list
-    with open(historyfile, "w") as file:
-        file.write('\n'.join(historylist))
+    with open(historyfile, "rb") as file:
+        for line in file:
+            line = line.rstrip()                # remove line breaks
+            if line:
+                historylist.append(line)        # keeps the last HISTMAX lines
+    # write back shortened list. history() appends behind the last line, so end it. 
+    with open(historyfile, "wb") as file:
+        file.write(b'\n'.join(historylist) + b'\n')
         file.flush()
 except OSError as e:
     # we should never end up here, but ... 
@@ -499,6 +701,7 @@ except OSError as e:
 
 # print greeting
 print("Hello Serial!")  # serial console
+display.auto_refresh = False
 tprint ("\r\nAdafruit CircuitPython {}".format(version))
 tprint ("\r\n{}".format(machine))
 # uncomment to debug boot process
@@ -508,155 +711,188 @@ tprint ("\r\n{}".format(machine))
 #        tprint ("\r" + line)
 tprint ("\r\n")
 tprint ("\r\n" + prompt + inv(' '))
-
-
-status_timeout = -1
+display.auto_refresh = True
+
+
+# result output format by type. We need to round the value to one digit less in order to 
+# avoid float64 rounding errors to be displayed. g also makes sure that trailing zeros are suppressed. 
+# MicroPython's format() does not support attribute fields like {0.real}, hence the functions. 
+FORMATS = {
+    complex: lambda r: "{:.15g}{:+.15g}j\r\n".format(r.real, r.imag),
+    int: "{:.15g}\r\n".format,
+    float: "{:.15g}\r\n".format,
+}
+
+
+def handle_key(state, key):
+    global cmdlen, cursor, mod_sym, historyptr, oldcommand, ans
+    global prompt, in_compound_statement, compound_statement
+    # print (" key {}, {}, state {}".format(key, ord(key), state))
+    if mod_sym != 0:   # we need to handle only SYM / CTRL
+        key = keymap[ord(key)]
+        key = chr(key) if key else ''   # unmapped keys insert nothing
+    if (state == STATE_PRESS):
+        # print (" key {}, state {}".format(key, state))
+        quick = None                    # set if only the end of the line needs to be redrawn
+        if key == KEY_UP:
+            # we'll go backward in the historylist until we reach the top.
+            lh = len(historylist)
+            if lh != 0:                 # make sure the list is not empty
+                if historyptr > -lh:
+                    historyptr -= 1
+                # if up is pressed for the first name, copy the former command for later
+                if historyptr == -1:
+                    oldcommand = bytes(command[:cmdlen])     # we need a real copy. 
+                cmd_set(historylist.get(historyptr))
+            # print ("key_up: ptr = {}, cursor = {}".format(historyptr, cursor))
+            # print ("        command: {}".format(command))
+        elif key == KEY_DOWN:
+            # we'll go forward in the historylist until we reach the youngest entry.
+            if historyptr < 0:
+                historyptr += 1 
+            # copy back former command if we're at the bottom
+            # else take the next entry down the list. 
+            if historyptr == 0:
+                cmd_set(oldcommand)
+            else:                            
+                cmd_set(historylist.get(historyptr))
+            # print ("key_down: ptr = {}, cursor = {}".format(historyptr, cursor))
+            # print ("          command: {}".format(command))
+        elif key == KEY_LEFT:
+            if cursor > 0:
+                cursor -= 1
+            # print ("key_left: cursor: {}, len: {}".format(cursor, cmdlen))
+        elif key == KEY_RIGHT:
+            if cursor < cmdlen:
+                cursor += 1
+            # print ("key_right: cursor: {}, len: {}".format(cursor, cmdlen))
+        elif key == KEY_ESC:
+            # end of plotting
+            display.root_group = root
+            update_status(status)            
+        elif key == KEY_SYM:
+            mod_sym = 1
+            # print ("setting mod_sym to ", mod_sym)
+        elif key == '\t':                       # tab
+            if in_compound_statement: 
+                cmd_insert("    ")              # 4 spaces.
+            else:
+                pass                            # tab completion? 
+        elif key in (KEY_ENTER, chr(5)):
+            result = None
+            line = cmd_str()
+            tprint('\r' + prompt + line + ceol)
+            # print ("enter: line = {}".format(line))
+            history(line)                       # erst in die History, falls was schief geht. 
+            historyptr = 0                      # reset pointer so we're at the bottom again. 
+            # print ("historylist: {}".format(historylist))
+
+            # check for compound statement first
+            if is_compound_statement(line):
+                in_compound_statement = True    # set state
+                prompt = ps2                    # change prompt to continuation prompt
+            if in_compound_statement:
+                if line == '':                  # when line is empty, it's the line finishing the compound statement
+                    result = process(compound_statement)      # process the statement
+                    if not isinstance(result, str): # ??? otherwise it was an error message.
+                        ans = result      
+                    prompt = ps1                # switch back prompt
+                else:                           # continue
+                    compound_statement += line + "\n"
+            elif line != '':                    # wenn nicht leer, ... 
+                result = process(line)          # ... ausführen. Fehler werden als result zurück gegeben. 
+                if not isinstance(result, str): # otherwise it was an error message.
+                    ans = result                    # Casio-like ANS string
+            # print ("enter: result = >{}<".format(result))
+            tprint ("\r\n")                     # nächste Zeile anfangen. 
+            if result is not None:              # wenn result leer, nichts
+                tprint(FORMATS.get(type(result), "{}\r\n".format)(result))  # str, errors, ... by default
+            cmdlen = 0
+            cursor = 0
+            # a full garbage collection stalls the keyboard, so we do it only after a command, 
+            # and only when memory gets low. 
+            if mem_free() < LOW_MEM:
+                collect()
+        elif key == KEY_BACKSPACE: 
+            if cursor > 0:
+                if cursor == cmdlen:
+                    quick = '\033[2D' + inv(' ') + ceol    # overwrite the last char with the cursor
+                cmd_delete()                    # technisch ist das das Zeichen _vor_ dem angezeigten Cursor. 
+            # print ("backsp: cursor: {}, len: {}".format(cursor, cmdlen))
+            # print ("backsp: command: {}".format(command))
+        else:
+            # default action- insert key at cursor pos. 
+            # nobody needs this for now. - alt-enter. 
+            if key == '|':
+                key = '=' 
+            n = cmdlen
+            at_end = cursor == cmdlen
+            cmd_insert(key) 
+            if at_end and cmdlen != n:
+                quick = move_cursor_left + key + inv(' ')   # overwrite the cursor with key, cursor behind it
+            # print ("else: cursor: {}, len: {}".format(cursor, cmdlen))
+            # print ("else: command: {}".format(command))
+        # now redraw entry line
+        if quick:
+            tprint(quick)
+            return
+        # insert cursor only for display - we work on a copy of command
+        line = cmd_str()
+        if cursor == cmdlen:
+            line = line + inv(' ')
+        elif cursor == 0:
+            line = inv(line[0]) + line[1:]
+        else:
+            line = line[:cursor] + inv(line[cursor]) + line[cursor+1:]    # slicing is fun - last index not included. 
+        display.auto_refresh = False            # one refresh for the whole line rather than per tile
+        tprint('\r' + prompt + line + ceol)     # print prompt, command, and delete until eol. 
+        display.auto_refresh = True
+    elif state == STATE_RELEASE:
+        if key == KEY_SYM:
+            mod_sym = 0
+            # print ("setting mod_sym to ", mod_sym)
+
+
+# idle loop timing. Right after a keypress we poll the keyboard (or its INT pin) often, then back off. 
+IDLE_MIN = 0.005                    # s
+IDLE_MAX = 0.1                      # s
+STATUS_INTERVAL = 10_000_000_000    # ns, the status line is updated every 10 s
+SCREEN_TIMEOUT = 60_000_000_000     # ns, screen goes dark after 60 s
+
+idle_delay = IDLE_MIN
+status_time = time.monotonic_ns() - STATUS_INTERVAL     # so that the status line shows up right away
 while True:
-    screen_timeout = 0
-    while kbd.key_count == 0:
-        status_timeout = (status_timeout + 1) % 90       # we update the status line every ~ 10s. 
-        if status_timeout == 0:
+    key_time = time.monotonic_ns()
+    dark = False
+    while (kbd.key_count == 0) if kbd_int is None else kbd_int.value:
+        now = time.monotonic_ns()
+        if now - status_time >= STATUS_INTERVAL:
             update_status(status)
-        screen_timeout = (screen_timeout + 1) % 500      # screen goes dark after ~ 60 s
-        if screen_timeout == 0:
+            history_flush()
+            status_time = now
+        if not dark and now - key_time >= SCREEN_TIMEOUT:
             kbd.backlight = 0.0
             kbd.backlight2 = 0.1
+            dark = True
         ''' 
         if tsc.touched:
             print ("touche")
-            screen_timeout = 0
+            key_time = now
+            dark = False
             kbd.backlight = 0.2
             kbd.backlight2 = 1.0
         ''' 
-        time.sleep(0.1)
+        time.sleep(idle_delay)
+        idle_delay = min(IDLE_MAX, idle_delay * 1.5)
     kbd.backlight = 0.2
     kbd.backlight2 = 1.0                # keypress -> turn it on again. 
+    idle_delay = IDLE_MIN
+    if kbd_int is not None:
+        kbd.interrupt_status = 0        # before reading the FIFO, so that no later key gets lost
     
     for keys in kbd.keys:               # this could be more than one. 
         (state, key) = keys
-        # print (" key {}, {}, state {}".format(key, ord(key), state))
-        if mod_sym != 0:   # we need to handle only SYM / CTRL
-            key = ord(key)
-            if 0 <= key < len(keymap):
-                key = keymap[key]
-        if (state == STATE_PRESS):
-            # print (" key {}, state {}".format(key, state))
-            if key == KEY_UP:
-                # we'll go backward in the historylist until we reach the top.
-                lh = len(historylist)
-                if lh != 0:                 # make sure the list is not empty
-                    if historyptr > -lh:
-                        historyptr -= 1
-                    # if up is pressed for the first name, copy the former command for later
-                    if historyptr == -1:
-                        oldcommand = command[0:]     # we need a real copy. 
-                    command = list(historylist[historyptr])
-                    cursor = len(command)
-                # print ("key_up: ptr = {}, cursor = {}".format(historyptr, cursor))
-                # print ("        command: {}".format(command))
-            elif key == KEY_DOWN:
-                # we'll go forward in the historylist until we reach the youngest entry.
-                if historyptr < 0:
-                    historyptr += 1 
-                # copy back former command if we're at the bottom
-                # else take the next entry down the list. 
-                if historyptr == 0:
-                    command = oldcommand[0:]
-                else:                            
-                    command = list(historylist[historyptr])
-                cursor = len(command)
-                # print ("key_down: ptr = {}, cursor = {}".format(historyptr, cursor))
-                # print ("          command: {}".format(command))
-            elif key == KEY_LEFT:
-                if cursor > 0:
-                    cursor -= 1
-                # print ("key_left: cursor: {}, len: {}".format(cursor, len(command)))
-            elif key == KEY_RIGHT:
-                if cursor < len(command):
-                    cursor += 1
-                # print ("key_right: cursor: {}, len: {}".format(cursor, len(command)))
-            elif key == KEY_ESC:
-                # end of plotting
-                display.root_group = root
-                update_status(status)            
-            elif key == KEY_SYM:
-                mod_sym = 1
-                # print ("setting mod_sym to ", mod_sym)
-            elif key == '\t':                       # tab
-                if in_compound_statement: 
-                    command.insert(cursor, "    ")  # 4 spaces.
-                    cursor += 4
-                else:
-                    pass                            # tab completion? 
-            elif key in (KEY_ENTER, chr(5)):
-                result = None
-                line = ''.join(command)
-                tprint('\r' + prompt + line + ceol)
-                # print ("enter: line = {}".format(line))
-                historylist = history(line, historylist)        # erst in die History, falls was schief geht. 
-                historyptr = 0                      # reset pointer so we're at the bottom again. 
-                # print ("historylist: {}".format(historylist))
-
-                # check for compound statement first
-                if is_compound_statement(line):
-                    in_compound_statement = True    # set state
-                    prompt = ps2                    # change prompt to continuation prompt
-                if in_compound_statement:
-                    if line == '':                  # when line is empty, it's the line finishing the compound statement
-                        result = process(compound_statement)      # process the statement
-                        if not isinstance(result, str): # ??? otherwise it was an error message.
-                            ans = result      
-                        prompt = ps1                # switch back prompt
-                    else:                           # continue
-                        compound_statement += line + "\n"
-                elif line != '':                    # wenn nicht leer, ... 
-                    result = process(line)          # ... ausführen. Fehler werden als result zurück gegeben. 
-                    if not isinstance(result, str): # otherwise it was an error message.
-                        ans = result                    # Casio-like ANS string
-                # print ("enter: result = >{}<".format(result))
-                tprint ("\r\n")                     # nächste Zeile anfangen. 
-                if result is None:                  # wenn result leer, 
-                    pass                            # nichts
-                elif isinstance (result, complex):
-                    # we need to round the value to one digit less in order to avoid float64 rounding errors to be displayed.
-                    # g also makes sure that trailing zeros are suppressed. 
-                    tprint ("{:.15g}{:+.15g}j\r\n".format(result.real, result.imag))
-                elif isinstance (result, (int, float)):
-                    tprint("{:.15g}\r\n".format(result))
-                else: # str, errors, ... 
-                    tprint("{}\r\n".format(result))
-                command = []
-                cursor = 0
-            elif key == KEY_BACKSPACE: 
-                if cursor > 0:
-                    cursor -= 1
-                    # print ("backsp: cursor: {}, len: {}".format(cursor, len(command)))
-                    del command[cursor]             # technisch ist das das Zeichen _vor_ dem angezeigten Cursor. 
-                # print ("backsp: cursor: {}, len: {}".format(cursor, len(command)))
-                # print ("backsp: command: {}".format(command))
-            else:
-                # default action- insert key at cursor pos. 
-                # nobody needs this for now. - alt-enter. 
-                if key == '|':
-                    key = '=' 
-                command.insert(cursor, key) 
-                cursor += 1
-                # print ("else: cursor: {}, len: {}".format(cursor, len(command)))
-                # print ("else: command: {}".format(command))
-            # now redraw entry line
-            # insert cursor only for display - we work on a copy of command
-            line = ''.join(command)
-            if cursor == len(line):
-                line = line + inv(' ')
-            elif cursor == 0:
-                line = inv(line[0]) + line[1:]
-            else:
-                line = line[:cursor] + inv(line[cursor]) + line[cursor+1:]    # slicing is fun - last index not included. 
-            tprint('\r' + prompt + line + ceol)     # print prompt, command, and delete until eol. 
-        elif state == STATE_RELEASE:
-            if key == KEY_SYM:
-                mod_sym = 0
-                # print ("setting mod_sym to ", mod_sym)
+        handle_key(state, key)
 
 
 # TODO: Sym-d macht supervisor.reload() 
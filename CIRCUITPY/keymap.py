@@ -14,129 +14,24 @@ KEY_SYM         = chr(18)
 #MOD_ALT         = const(17)
 #MOD_SYM         = const(18)
 
-keymap = [
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    KEY_SYM,
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '',
-    '*',   # a
-    '',  
-    '',
-    '',
-    '',  
-    '&', 
-    '',  
-    '',  
-    '<', 
-    '',  
-    '',  
-    '',  
-    '',  
-    '',  
-    '>', 
-    '@', 
-    '@', 
-    '{', 
-    '%', 
-    '[', 
-    '}', 
-    '',  
-    '^', 
-    '',  
-    ']', 
-    '',  
-]
-
+# SYM layer: key code -> key code while SYM is held, 0 = no key. 
+# One bytes entry per possible key code, so it can be indexed without a range check. 
+_sym = bytearray(256)
+_sym[ord(KEY_SYM)] = ord(KEY_SYM)
+for _key, _symkey in (
+    ('a', '*'), 
+    ('f', '&'), 
+    ('i', '<'), 
+    ('o', '>'), 
+    ('p', '@'), 
+    ('q', '@'), 
+    ('r', '{'), 
+    ('s', '%'), 
+    ('t', '['), 
+    ('u', '}'), 
+    ('w', '^'), 
+    ('y', ']'), 
+):
+    _sym[ord(_key)] = ord(_symkey)
+keymap = bytes(_sym)
+del _sym, _key, _symkey
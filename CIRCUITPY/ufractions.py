@@ -9,16 +9,27 @@
 import math as m
 
 
-def _gcd(x, y):
-    while y != 0:
-        x, y = y, x % y
-    return abs(x)
+try:
+    from math import gcd as _gcd        # C builtin, if the firmware has it
+except ImportError:
+    # no viper version here: viper ints are machine words, and fractions easily outgrow them.
+    def _gcd(x, y):
+        while y != 0:
+            x, y = y, x % y
+        return abs(x)
+
+
+# powers of ten for from_float(), so that we do not compute 10**n on every call.
+_POW10 = tuple(10**i for i in range(19))
+
+def _pow10(n):
+    return _POW10[n] if 0 <= n < 19 else 10**n      # negative n gives a float, as before
     
 
 class frac(object):
     '''simple fractions class'''
     
-    # __slots__ = ("_num", "_den")
+    __slots__ = ("_num", "_den")
     
     def __new__(cls, numerator, denominator):
         self = object.__new__(cls)
@@ -29,9 +40,8 @@ class frac(object):
         # TODO parse other formats, like num / den 
         # use regexp. 
         # reduce to lowest denominator
-        gcd = _gcd(numerator, denominator)
-        # mul = 1 if den > 0 else -1
-        mul = m.copysign(1, denominator)
+        gcd = 1 if denominator == 1 else _gcd(numerator, denominator)   # frac(n, 1) is the common case
+        mul = -1 if denominator < 0 else 1      # int, m.copysign() would turn num and den into floats
         self._num = numerator // gcd  * mul    # and make sure the denominator is positive. 
         self._den = denominator // gcd  * mul
         return self
@@ -117,13 +127,13 @@ class frac(object):
             else: 
                 (ints, decimals) = x.split('.') 
                 num = int(ints + decimals)          # generate an integer of len(ints + decimals)
-                den = 10**(len(ints + decimals))
+                den = _pow10(len(ints + decimals))
         elif isinstance (x, float) and decimals == None:
             raise ValueError ("pass arg as string or add number of decimals as second arg")
         else:           # here we know it's a float and the number of decimals
-            mul = 10**decimals
+            mul = _pow10(decimals)
             num = int(m.floor(x * mul + 0.5))
-            den = 10**(m.ceil(m.log10(num)))
+            den = _pow10(m.ceil(m.log10(num)))
         return frac(num, den)
         
         
@@ -5,367 +5,293 @@
 # Mathematical constants and convenience function wrappers. 
 # these wrappers determine the type of a variable and invoke the
 # appropriate backend function from math, cmath, or numpy. 
+# This module is for the board only, it needs ulab. Host side timings are in 
+# host_benchmark.py in the repository root. 
 
-import sys
+import sys                          # not used here, but exported to the command line like i below
 import math as m
 import cmath as cm
-import ulab.scipy.integrate as i
+import ulab.scipy.integrate as i    # not used here, but exported to the command line via 
+                                    # "from umath import *", e.g. i.quad(f, 0, 1). ulab is 
+                                    # built into the firmware, so the import costs no code RAM. 
 import ulab.numpy as np
-from collections import namedtuple
 from uncertainty import ufloat as u
 from ufractions import frac as fr
 
 
-# create some immutable variables. 
+# physical constants, used as c.h, c.kb etc. 
 # we use m.pi and m.e etc. directly. 
+# Plain class attributes are cheaper to look up than namedtuple fields. 
 # TODO: Umrechnungskonstanten
-ConstantsNamespace = namedtuple(
-    "ConstantsNamespaces", ["c",
-                            "g",
-                            "h",
-                            "hb",
-                            "e",
-                            "mu0",
-                            "ep0",
-                            "a",               
-                            "mu",
-                            "me",
-                            "mp",
-                            "mn",
-                            "kb",
-                            "na",
-                            "fc",
-                            "rc",
-                            "vm",
-                            "si",    
-                           ]
-)
-
-c = ConstantsNamespace( 299792458.0,             # c     c0 (exact)                        m/s
-                        6.67430e-11,             # g     Newton's gravitational constant   m³ / (kg * s²)
-                        6.62607015e-34,          # h     Planck's constant (exact)         Js 
-                        1.0545718176461565e-34,  # hb    h bar = h / 2 pi                  Js   
-                        1.602176634e-19,         # e     elementary charge (exact)         As  
-                        1.25663706212e-6,        # mu0   vacuum magnetic permeability      Vs / Am
-                        8.8541878128e-12,        # ep0   vacuum electric permittivity      As / Vm
-                        7.2973525693e-3,         # a     alpha (fine structure constant)
-                        1.66053906660e-27,       # mu    atomic mass constant              kg
-                        9.1093837015e-31,        # me    electron mass                     kg
-                        1.67262192369e-27,       # mp    proton mass                       kg
-                        1.6749274980437807e-27,  # mn    neutron mass                      kg
-                        1.380649e-23,            # kb    Boltzmann's constant (exact)      J/K
-                        6.02214076e23,           # na    Avogadro's constant  (exact)      1 / mol
-                        96485.33212,             # fc    Faraday's constant NA * e         C / mol
-                        8.31446261815324,        # rc    molar gas constant                J / (mol * K)
-                        22.41396954e-3,          # vm    molar volume of ideal gas         m³ / mol
-                        5.670374419e-8,          # si    sigma, Stefan-Boltzmann constant  W / (m² * K^4)
-)
+class c:
+    c   = 299792458.0               # c0 (exact)                        m/s
+    g   = 6.67430e-11               # Newton's gravitational constant   m³ / (kg * s²)
+    h   = 6.62607015e-34            # Planck's constant (exact)         Js 
+    hb  = 1.0545718176461565e-34    # h bar = h / 2 pi                  Js   
+    e   = 1.602176634e-19           # elementary charge (exact)         As  
+    mu0 = 1.25663706212e-6          # vacuum magnetic permeability      Vs / Am
+    ep0 = 8.8541878128e-12          # vacuum electric permittivity      As / Vm
+    a   = 7.2973525693e-3           # alpha (fine structure constant)
+    mu  = 1.66053906660e-27         # atomic mass constant              kg
+    me  = 9.1093837015e-31          # electron mass                     kg
+    mp  = 1.67262192369e-27         # proton mass                       kg
+    mn  = 1.6749274980437807e-27    # neutron mass                      kg
+    kb  = 1.380649e-23              # Boltzmann's constant (exact)      J/K
+    na  = 6.02214076e23             # Avogadro's constant  (exact)      1 / mol
+    fc  = 96485.33212               # Faraday's constant NA * e         C / mol
+    rc  = 8.31446261815324          # molar gas constant                J / (mol * K)
+    vm  = 22.41396954e-3            # molar volume of ideal gas         m³ / mol
+    si  = 5.670374419e-8            # sigma, Stefan-Boltzmann constant  W / (m² * K^4)
+
+
+_INV_LN2 = 1.0 / m.log(2.0)
 
 
 # all these math wrappers 
+# each wrapper looks up the backend function for type(x) in a dict, which is cheaper than 
+# a chain of isinstance() checks. Anything not in the dict (bool, subclasses, ...) goes 
+# to the function for reals, like the else branch used to. 
 
 # TODO help
 
+# the complex helpers below take the math functions they use as default arguments, so that 
+# they are local lookups rather than a global plus an attribute lookup each. They are private, 
+# so nobody passes these arguments. The public wrappers keep their plain signatures. 
 
-def acos(x):
-    if isinstance (x, np.ndarray):
-        return np.acos(x)
-    elif isinstance (x, complex): 
-        # https://de.wikipedia.org/wiki/Arkussinus_und_Arkuskosinus#Komplexe_Argumente
-        return m.pi/2 - asin(x) 
-    else:               # argument is type real, i.e. int, float
-        return m.acos(x)
-
-
-def acosh(x):
-    if isinstance (x, np.ndarray):
-        return np.acosh(x)
-    elif isinstance (x, complex): 
-        # https://de.wikipedia.org/wiki/Areasinus_hyperbolicus_und_Areakosinus_hyperbolicus#Numerische_Berechnung
-        # see also: Bronstein, Taschenbuch der Mathematik, 1979, p.570
-        return cm.log(x + cm.sqrt(x*x - 1))
-    else:               # argument is type real, i.e. int, float
-        return m.acosh(x)
-
-
-def asin(x):
-    if isinstance (x, np.ndarray):
-        return np.asin(x)
-    elif isinstance (x, complex): 
-        # https://de.wikipedia.org/wiki/Arkussinus_und_Arkuskosinus#Komplexe_Argumente
-        r = x.real
-        i = x.imag
-        real_part = 0.5 * m.acos(m.sqrt((r*r + i*i - 1)**2 + 4*i*i) - (r*r + i*i)) * m.copysign(1, r)
-        imag_part = 0.5 * m.acosh(m.sqrt((r*r + i*i - 1)**2 + 4*i*i) + (r*r + i*i)) * m.copysign(1, i)
-        return complex(real_part, imag_part)
-    else:               # argument is type real, i.e. int, float
-        return m.asin(x)
-
-
-def asinh(x):
-    if isinstance (x, np.ndarray):
-        return np.asinh(x)
-    elif isinstance (x, complex): 
-        # https://de.wikipedia.org/wiki/Areasinus_hyperbolicus_und_Areakosinus_hyperbolicus#Numerische_Berechnung
-        # see also: Bronstein, Taschenbuch der Mathematik, 1979, p.570
-        return cm.log(x + cm.sqrt(x*x + 1))
-    else:               # argument is type real, i.e. int, float
-        return m.asinh(x)
-
-
-def atan(x):
-    if isinstance (x, np.ndarray):
-        return np.atan(x)
-    elif isinstance (x, complex): 
-        # https://de.wikipedia.org/wiki/Arkustangens_und_Arkuskotangens#Komplexer_Arkustangens_und_Arkuskotangens
-        r = x.real
-        i = x.imag
-        if r != 0:
-            real_part = 0.5 * (m.atan((r*r + i*i - 1) / (2 * r)) + m.pi/2 * m.copysign(1, r))
-        elif r == 0 and abs(i) <= 1:
-            real_part = 0.0
-        else:  # r == 0 and |i| > 1
-            real_part = m.pi/2 * m.copysign(1, i)
-        imag_part = 0.5 * m.atanh(2 * i / (r*r + i*i + 1)) 
-        return complex(real_part, imag_part)
-    else:               # argument is type real, i.e. int, float
-        return m.atan(x)
 
+def _unsupported(*args):
+    raise TypeError (f'unsupported data type')  
 
-def atan2(x, y):		
-    if isinstance (x, np.ndarray):
-        return np.arctan2(x, y)
-    elif isinstance (x, complex): 
-        raise TypeError (f'unsupported data type')  
-    else:
-    	return m.atan2(x, y)
-
-
-def atanh(x):
-    if isinstance (x, np.ndarray):
-        return np.atanh(x)
-    elif isinstance (x, complex): 
-        # https://de.wikipedia.org/wiki/Areatangens_hyperbolicus_und_Areakotangens_hyperbolicus
-        # see also: Bronstein, Taschenbuch der Mathematik, 1979, p.570
-        return 0.5 * cm.log((1+x)/(1-x))
-    else:               # argument is type real, i.e. int, float
-        return m.atanh(x)
-
-
-def cos(x):
-    if isinstance (x, np.ndarray):
-        return np.cos(x)
-    elif isinstance (x, complex): 
-        return cm.cos(x)
-    else:               # argument is type real, i.e. int, float
-        return m.cos(x)
-
-
-def cosh(x):
-    if isinstance (x, np.ndarray):
-        return np.cosh(x)
-    elif isinstance (x, complex): 
-        # https://de.wikipedia.org/wiki/Sinus_hyperbolicus_und_Kosinus_hyperbolicus#Komplexe_Argumente
-        r = x.real
-        i = x.imag
-        real_part = m.cos(i) * m.cosh(r)
-        imag_part = m.sin(i) * m.sinh(r)
-        return complex(real_part, imag_part)
-    else:               # argument is type real, i.e. int, float
-        return m.cosh(x)
-
-
-def degrees(x):
-    if isinstance (x, np.ndarray):
-        return np.degrees(x)
-    elif isinstance (x, complex): 
-        raise TypeError (f'unsupported data type')  
-    else:
-        return m.degrees(x)
 
-deg = degrees    
+def _acos_complex(x):
+    # https://de.wikipedia.org/wiki/Arkussinus_und_Arkuskosinus#Komplexe_Argumente
+    return m.pi/2 - _asin_complex(x) 
 
-def erf(x):
-    if isinstance (x, np.ndarray):
-        vecf = np.vectorize(m.erf)
-        return vecf(x)
-    elif isinstance (x, complex): 
-        raise TypeError (f'unsupported data type')  
-    else:
-        return m.erf(x)
 
+def _acosh_complex(x):
+    # https://de.wikipedia.org/wiki/Areasinus_hyperbolicus_und_Areakosinus_hyperbolicus#Numerische_Berechnung
+    # see also: Bronstein, Taschenbuch der Mathematik, 1979, p.570
+    return cm.log(x + cm.sqrt(x*x - 1))
 
-def erfc(x):
-    if isinstance (x, np.ndarray):
-        vecf = np.vectorize(m.erfc)
-        return vecf(x)
-    elif isinstance (x, complex): 
-        raise TypeError (f'unsupported data type')  
-    else:
-        return m.erfc(x)
-
-
-def exp(x):
-    if isinstance (x, np.ndarray):
-        return np.exp(x)
-    elif isinstance (x, complex): 
-        (r, theta) = polar(x)
-        return complex(m.exp(r) * m.cos(theta), m.exp(r) * m.sin(theta))
-    else:
-        return m.exp(x)
-
-
-def expm1(x):
-    if isinstance (x, np.ndarray):
-        return np.expm1(x)
-    elif isinstance (x, complex): 
-        (r, theta) = polar(x)
-        return complex(m.expm1(r) * m.cos(theta), m.expm1(r) * m.sin(theta))
-    else:
-        return m.expm1(x)
-
-
-def fabs(x):
-    if isinstance (x, np.ndarray):
-        vecf = np.vectorize(m.fabs)
-        return vecf(x)
-    elif isinstance (x, complex): 
-        return m.sqrt(x.real*x.real + x.imag*x.imag)
-    else:
-        return m.fabs(x)
-
-
-def gamma(x):
-    if isinstance (x, np.ndarray):
-        vecf = np.vectorize(m.gamma)
-        return vecf(x)
-    elif isinstance (x, complex): 
-        raise TypeError (f'unsupported data type')  
-    else:
-        return m.gamma(x)
 
+def _asin_complex(x, _asin=m.asin, _acos=m.acos, _acosh=m.acosh, _sqrt=m.sqrt, _copysign=m.copysign):
+    # https://de.wikipedia.org/wiki/Arkussinus_und_Arkuskosinus#Komplexe_Argumente
+    r = x.real
+    i = x.imag
+    if i == 0.0 and -1.0 <= r <= 1.0:       # real argument in disguise, e.g. after cm.sqrt()
+        return complex(_asin(r), 0.0)
+    m2 = r*r + i*i                          # |x|², the root is shared by both parts
+    t = m2 - 1
+    d = _sqrt(t*t + 4*i*i)
+    real_part = 0.5 * _acos(d - m2) * _copysign(1, r)
+    imag_part = 0.5 * _acosh(d + m2) * _copysign(1, i)
+    return complex(real_part, imag_part)
 
-def lgamma(x):
-    if isinstance (x, np.ndarray):
-        vecf = np.vectorize(m.lgamma)
-        return vecf(x)
-    elif isinstance (x, complex): 
-        raise TypeError (f'unsupported data type')  
-    else:
-        return m.lgamma(x)
 
+def _asinh_complex(x):
+    # https://de.wikipedia.org/wiki/Areasinus_hyperbolicus_und_Areakosinus_hyperbolicus#Numerische_Berechnung
+    # see also: Bronstein, Taschenbuch der Mathematik, 1979, p.570
+    return cm.log(x + cm.sqrt(x*x + 1))
 
-def log(x):
-    if isinstance (x, np.ndarray):
-        return np.log(x)
-    elif isinstance (x, complex) or x < 0: 
-        return cm.log(x)
-    else:               # argument is not negative and type real, i.e. int, float
-        return m.log(x)
 
-ln = log 
+def _atan_complex(x, _atan=m.atan, _atanh=m.atanh, _copysign=m.copysign, _pi_2=m.pi/2):
+    # https://de.wikipedia.org/wiki/Arkustangens_und_Arkuskotangens#Komplexer_Arkustangens_und_Arkuskotangens
+    r = x.real
+    i = x.imag
+    if i == 0.0:
+        return complex(_atan(r), 0.0)
+    if r != 0:
+        real_part = 0.5 * (_atan((r*r + i*i - 1) / (2 * r)) + _pi_2 * _copysign(1, r))
+    elif r == 0 and abs(i) <= 1:
+        real_part = 0.0
+    else:  # r == 0 and |i| > 1
+        real_part = _pi_2 * _copysign(1, i)
+    imag_part = 0.5 * _atanh(2 * i / (r*r + i*i + 1)) 
+    return complex(real_part, imag_part)
 
-def log10(x):
-    if isinstance (x, np.ndarray):
-        return np.log10(x)
-    elif isinstance (x, complex) or x < 0: 
-        return cm.log10(x)
-    else:               # argument is not negative and type real, i.e. int, float
-        return m.log10(x)
 
-lg = log10                              # this is what we used in the old days, so bear with me. 
+def _atanh_complex(x):
+    # https://de.wikipedia.org/wiki/Areatangens_hyperbolicus_und_Areakotangens_hyperbolicus
+    # see also: Bronstein, Taschenbuch der Mathematik, 1979, p.570
+    return 0.5 * cm.log((1+x)/(1-x))
 
-def log2(x):
-    if isinstance (x, np.ndarray):
-        return np.log2(x)
-    elif isinstance (x, complex) or x < 0: 
-        return cm.log(x) / m.log(2.0)
-    else:               # argument is not negative and type real, i.e. int, float
-        return m.log2(x)
 
+def _cosh_complex(x, _cos=m.cos, _sin=m.sin, _cosh=m.cosh, _sinh=m.sinh):
+    # https://de.wikipedia.org/wiki/Sinus_hyperbolicus_und_Kosinus_hyperbolicus#Komplexe_Argumente
+    r = x.real
+    i = x.imag
+    if i == 0.0:
+        return complex(_cosh(r), 0.0)
+    real_part = _cos(i) * _cosh(r)
+    imag_part = _sin(i) * _sinh(r)
+    return complex(real_part, imag_part)
 
-def radians(x):
-    if isinstance (x, np.ndarray):
-        return np.radians(x)
-    elif isinstance (x, complex): 
-        raise TypeError (f'unsupported data type')  
-    else:
-        return m.radians(x)
-
-rad = radians    
-
-def sin(x):
-    '''return the sin of x.'''
-    if isinstance (x, np.ndarray):
-        return np.sin(x)
-    elif isinstance (x, complex): 
-        return cm.sin(x)
-    else:               # argument is type real, i.e. int, float
-        return m.sin(x)
-
-
-def sinh(x):
-    if isinstance (x, np.ndarray):
-        return np.sinh(x)
-    elif isinstance (x, complex): 
-        # https://de.wikipedia.org/wiki/Sinus_hyperbolicus_und_Kosinus_hyperbolicus#Komplexe_Argumente
-        r = x.real
-        i = x.imag
-        real_part = m.cos(i) * m.sinh(r)
-        imag_part = m.sin(i) * m.cosh(r)
-        return complex(real_part, imag_part)
-    else:               # argument is type real, i.e. int, float
-        return m.sinh(x)
-
-
-def sqrt(x):
-    if isinstance (x, np.ndarray):
-        return np.sqrt(x)
-    elif isinstance (x, complex) or x < 0: 
-        return cm.sqrt(x)
-    else:               # argument is not negative and type real, i.e. int, float
-        return m.sqrt(x)
-
-
-def tan(x):
-    if isinstance (x, np.ndarray):
-        return np.tan(x)
-    elif isinstance (x, complex): 
-        return cm.sin(x) / cm.cos(x)
-    else:               # argument is type real, i.e. int, float
-        return m.tan(x)
-
-
-def tanh(x):
-    if isinstance (x, np.ndarray):
-        return np.tanh(x)
-    elif isinstance (x, complex): 
-        # https://de.wikipedia.org/wiki/Tangens_hyperbolicus_und_Kotangens_hyperbolicus#Numerische_Berechnung
-        # see also: Bronstein, Taschenbuch der Mathematik, 1979, p.567
-        return cm.sinh(x) / cm.cosh(x)
-    else:               # argument is type real, i.e. int, float
-        return m.tanh(x)
 
+def _expm1_complex(x, _exp=m.exp, _expm1=m.expm1, _cos=m.cos, _sin=m.sin):
+    # there is no cm.expm1, and cm.exp(x) - 1 cancels for small x. 
+    # exp(r + j*i) - 1 = expm1(r) cos(i) + (cos(i) - 1) + j exp(r) sin(i), with cos(i) - 1 = -2 sin²(i/2)
+    r = x.real
+    i = x.imag
+    s = _sin(0.5 * i)
+    real_part = _expm1(r) * _cos(i) - 2 * s * s
+    imag_part = _exp(r) * _sin(i)
+    return complex(real_part, imag_part)
+
+
+def _log_real(x):
+    return cm.log(x) if x < 0 else m.log(x)
+
+
+def _log10_real(x):
+    return cm.log10(x) if x < 0 else m.log10(x)
+
+
+def _log2_complex(x):
+    return cm.log(x) * _INV_LN2
+
+
+def _log2_real(x):
+    return _log2_complex(x) if x < 0 else m.log2(x)
+
+
+def _sinh_complex(x, _cos=m.cos, _sin=m.sin, _cosh=m.cosh, _sinh=m.sinh):
+    # https://de.wikipedia.org/wiki/Sinus_hyperbolicus_und_Kosinus_hyperbolicus#Komplexe_Argumente
+    r = x.real
+    i = x.imag
+    if i == 0.0:
+        return complex(_sinh(r), 0.0)
+    real_part = _cos(i) * _sinh(r)
+    imag_part = _sin(i) * _cosh(r)
+    return complex(real_part, imag_part)
+
+
+def _sqrt_real(x):
+    return cm.sqrt(x) if x < 0 else m.sqrt(x)
+
+
+def _tan_complex(x):
+    # tan(x) = -j tanh(jx). There is no cm.tan in MicroPython. 
+    t = _tanh_complex(complex(-x.imag, x.real))
+    return complex(t.imag, -t.real)
+
+
+def _tanh_complex(x, _sin=m.sin, _cos=m.cos, _sinh=m.sinh, _cosh=m.cosh, _copysign=m.copysign):
+    # https://de.wikipedia.org/wiki/Tangens_hyperbolicus_und_Kotangens_hyperbolicus#Numerische_Berechnung
+    # see also: Bronstein, Taschenbuch der Mathematik, 1979, p.567
+    # tanh(r + j*i) = (sinh(2r) + j sin(2i)) / (cosh(2r) + cos(2i)), one division and no cmath, 
+    # which has neither sinh nor cosh in MicroPython. 
+    r = x.real
+    i = x.imag
+    if abs(r) > 20.0:                       # cosh(2r) would overflow, and tanh is ±1 to 17 digits
+        return complex(_copysign(1.0, r), 0.0)
+    d = _cosh(2*r) + _cos(2*i)
+    return complex(_sinh(2*r) / d, _sin(2*i) / d)
+
+
+# MicroPython's cmath has only cos, exp, log, log10, phase, polar, rect, sin and sqrt. 
+# Where a firmware has more, getattr() picks the C function over our own formula. 
+def _dispatch(real, cplx, array):
+    return {int: real, float: real, complex: cplx, np.ndarray: array}
+
+
+def _wrap(table, default):
+    # builds a wrapper for the backend functions in table. One small closure per wrapper 
+    # rather than a code object each, and table.get is looked up once here. 
+    get = table.get
+    def wrapper(x):
+        return get(type(x), default)(x)
+    return wrapper
+
+
+_ACOS = _dispatch(m.acos, getattr(cm, "acos", _acos_complex), np.acos)
+_ACOSH = _dispatch(m.acosh, getattr(cm, "acosh", _acosh_complex), np.acosh)
+_ASIN = _dispatch(m.asin, _asin_complex, np.asin)
+_ASINH = _dispatch(m.asinh, getattr(cm, "asinh", _asinh_complex), np.asinh)
+_ATAN = _dispatch(m.atan, _atan_complex, np.atan)
+_ATAN2 = _dispatch(m.atan2, _unsupported, np.arctan2)
+_ATANH = _dispatch(m.atanh, getattr(cm, "atanh", _atanh_complex), np.atanh)
+_COS = _dispatch(m.cos, cm.cos, np.cos)
+_COSH = _dispatch(m.cosh, _cosh_complex, np.cosh)
+_DEGREES = _dispatch(m.degrees, _unsupported, np.degrees)
+_EXP = _dispatch(m.exp, cm.exp, np.exp)
+_EXPM1 = _dispatch(m.expm1, _expm1_complex, np.expm1)
+_LOG = _dispatch(_log_real, cm.log, np.log)
+_LOG10 = _dispatch(_log10_real, cm.log10, np.log10)
+_LOG2 = _dispatch(_log2_real, _log2_complex, np.log2)
+_RADIANS = _dispatch(m.radians, _unsupported, np.radians)
+_SIN = _dispatch(m.sin, cm.sin, np.sin)
+_SINH = _dispatch(m.sinh, _sinh_complex, np.sinh)
+_SQRT = _dispatch(_sqrt_real, cm.sqrt, np.sqrt)
+_TAN = _dispatch(m.tan, _tan_complex, np.tan)
+_TANH = _dispatch(m.tanh, _tanh_complex, np.tanh)
 
-# complex only
 
-# TODO does not return anything here? 
-def polar(x):		
-	return cm.polar(x)
+acos = _wrap(_ACOS, m.acos)
+acosh = _wrap(_ACOSH, m.acosh)
+asin = _wrap(_ASIN, m.asin)
+asinh = _wrap(_ASINH, m.asinh)
+atan = _wrap(_ATAN, m.atan)
 
 
-def rect(r, theta):		
-	return cm.rect(r, theta)
+def atan2(x, y):		
+    return _ATAN2.get(type(x), m.atan2)(x, y)
+
+
+atanh = _wrap(_ATANH, m.atanh)
+cos = _wrap(_COS, m.cos)
+cosh = _wrap(_COSH, m.cosh)
+degrees = _wrap(_DEGREES, m.degrees)
+deg = degrees
+
+
+def _fabs_complex(x):
+    return hypot(x.real, x.imag)            # does not overflow for large parts if it is math.hypot
+
 
+# m.erf etc. have no ulab counterpart, so arrays go through np.vectorize(). 
+# The vectorized functions are built once here and not on every call. 
+_ERF = _dispatch(m.erf, _unsupported, np.vectorize(m.erf))
+_ERFC = _dispatch(m.erfc, _unsupported, np.vectorize(m.erfc))
+_FABS = _dispatch(m.fabs, _fabs_complex, abs)        # ulab has no np.abs, arrays support the builtin abs()
+_GAMMA = _dispatch(m.gamma, _unsupported, np.vectorize(m.gamma))
+_LGAMMA = _dispatch(m.lgamma, _unsupported, np.vectorize(m.lgamma))
 
-def phase(x):		
-	return cm.phase(x) 
+
+erf = _wrap(_ERF, m.erf)
+erfc = _wrap(_ERFC, m.erfc)
+exp = _wrap(_EXP, m.exp)
+expm1 = _wrap(_EXPM1, m.expm1)
+fabs = _wrap(_FABS, m.fabs)
+gamma = _wrap(_GAMMA, m.gamma)
+lgamma = _wrap(_LGAMMA, m.lgamma)
+log = _wrap(_LOG, _log_real)
+ln = log
+log10 = _wrap(_LOG10, _log10_real)
+lg = log10                              # this is what we used in the old days, so bear with me. 
+log2 = _wrap(_LOG2, _log2_real)
+radians = _wrap(_RADIANS, m.radians)
+rad = radians
+sin = _wrap(_SIN, m.sin)
+sinh = _wrap(_SINH, m.sinh)
+sqrt = _wrap(_SQRT, _sqrt_real)
+tan = _wrap(_TAN, m.tan)
+tanh = _wrap(_TANH, m.tanh)
+
+
+# complex only
+# plain renames, so the cmath functions are bound directly rather than wrapped. 
+polar = cm.polar
+rect = cm.rect
+phase = cm.phase
 
 # reals only
 
-def hypot(x, y):
-    # this will raise a data type error if needed. 
-    return m.sqrt(x*x + y*y)
+try:
+    from math import hypot              # C builtin, if the firmware has it
+except ImportError:
+    def hypot(x, y):
+        # this will raise a data type error if needed. 
+        return m.sqrt(x*x + y*y)
 
 	
 '''
@@ -377,35 +303,58 @@ def lcm(*args):
     return m.lcm(args)
 '''
 
+try:
+    from math import gcd as _gcd        # C builtin, if the firmware has it
+except ImportError:
+    def _gcd(x, y):
+        while y != 0:
+            x, y = y, x % y
+        return abs(x)
+
+try:
+    from math import lcm as _lcm        # C builtin, if the firmware has it
+except ImportError:
+    def _lcm(x, y):
+        # divide first, so that the intermediate product is no larger than the result
+        return abs(x // _gcd(x, y) * y)
+
+
 def gcd(x, y):		
-    if isinstance (x, complex): 
+    if type(x) is complex: 
         raise TypeError (f'unsupported data type')  
-    if not isinstance(x, int) or not isinstance (y, int): 
+    if type(x) is not int or type(y) is not int: 
         raise ValueError ("gcd(x, y), x and/or y not integer")
     if x == 0 or y == 0:
         raise ValueError ("gcd(x, y), x and/or y not integer")
-    while y != 0:
-        x, y = y, x % y
-    return m.fabs(x)
+    return _gcd(abs(x), abs(y))
 
 
 def lcm(x, y):	
-    if isinstance (x, complex): 
+    if type(x) is complex: 
         raise TypeError (f'unsupported data type')  
-    if not isinstance(x, int) or not isinstance (y, int): 
+    if type(x) is not int or type(y) is not int: 
         raise ValueError ("lcm(x, y), x and/or y not integer")
     if x == 0 or y == 0:
         raise ValueError ("lcm(x, y), x and/or y not integer")
-    return m.fabs(x * y) / gcd(x, y)
+    return _lcm(x, y)
 
 	
-def factorial(x):
-    if isinstance (x, complex): 
-        vecf = np.vectorize(m.factorial)
-        return vecf(x)
-    if isinstance(x, float): 
-        return m.gamma(x+1)
-    return m.factorial(x)
+_FACTORIALS = tuple(m.factorial(n) for n in range(21))    # 0! .. 20!, the usual calculator range
+
+
+def _factorial_int(x):
+    return _FACTORIALS[x] if 0 <= x <= 20 else m.factorial(x)
+
+
+def _factorial_float(x):
+    return m.gamma(x+1)
+
+
+_FACTORIAL = {int: _factorial_int, float: _factorial_float, complex: _unsupported, 
+              np.ndarray: np.vectorize(m.factorial)}
+
+
+factorial = _wrap(_FACTORIAL, m.factorial)
     
     
 fact = factorial
@@ -15,22 +15,47 @@
 import math as m
 
 erf_coef = 2.0 / m.sqrt(m.pi) # for erf / erfc
+_LN10 = m.log(10.0)             # for log10 / log2
+_LN2 = m.log(2.0)
+_DEG_PER_RAD = 180.0 / m.pi     # for degrees / radians
+_RAD_PER_DEG = m.pi / 180.0
+_PSI_C1 = 1.0 / 12.0            # for _psi
+_PSI_C2 = 1.0 / 120.0
+_PSI_C3 = 1.0 / 252.0
+_PSI_C4 = 1.0 / 240.0
+_PSI_C5 = 1.0 / 132.0
+
+try:
+    from math import hypot as _hypot    # C builtin, if the firmware has it
+except ImportError:
+    def _hypot(x, y):
+        return m.sqrt(x*x + y*y)
 
 class ufloat(object):
     '''uncertainties class for float'''
     
     __slots__ = ("nomval", "stddev")
     
-    def __new__(cls, nomval, stddev):
-        self = object.__new__(cls)
-        if not isinstance(nomval, (int, float)) or not isinstance (stddev, (int, float)):
+    def __init__(self, nomval, stddev):
+        tn = type(nomval)
+        ts = type(stddev)
+        if (tn is not float and tn is not int) or (ts is not float and ts is not int):
             raise TypeError ("nomval and stderr must be int or float")
-        else:
-            # auto-convert int to float
-            self.nomval = float(nomval)
-            self.stddev = abs(float(stddev)) # by definition, the stddev is always non-negative. 
-            # TODO parse other formats, like nomval+-stddev or nomval(stddev) 
-            # use regexp. 
+        # auto-convert int to float
+        self.nomval = nomval if tn is float else float(nomval)
+        stddev = stddev if ts is float else float(stddev)
+        self.stddev = stddev if stddev >= 0 else -stddev    # by definition, the stddev is always non-negative. 
+        # TODO parse other formats, like nomval+-stddev or nomval(stddev) 
+        # use regexp. 
+        
+
+    @classmethod
+    def _raw(cls, nomval, stddev):
+        # internal constructor for results, without the checks and conversions of __init__. 
+        # nomval and stddev must both be floats. Derivatives may be negative, so we take abs here. 
+        self = object.__new__(cls)
+        self.nomval = nomval
+        self.stddev = stddev if stddev >= 0 else -stddev
         return self
         
 
@@ -88,33 +113,33 @@ class ufloat(object):
         # return cov
         
     # Gaussian error propagation, mostly. 
+    # Since _covariance() is 0, the cov terms are left out of the formulas below. 
+    # The complete formulas are in the comments. 
     
     def __add__(self, other):
-        cov = self._covariance(other)
-        return ufloat(self.nomval + other.nomval, m.sqrt(self.stddev**2 + other.stddev**2 + 2*cov))
+        # sqrt(sa² + sb² + 2*cov)
+        return ufloat._raw(self.nomval + other.nomval, m.sqrt(self.stddev*self.stddev + other.stddev*other.stddev))
         
     
     def __sub__(self, other):    
-        cov = self._covariance(other)
-        return ufloat(self.nomval - other.nomval, m.sqrt(self.stddev**2 + other.stddev**2 - 2*cov))
+        # sqrt(sa² + sb² - 2*cov)
+        return ufloat._raw(self.nomval - other.nomval, m.sqrt(self.stddev*self.stddev + other.stddev*other.stddev))
 
 
     def __mul__(self, other):
-        cov = self._covariance(other)
         nomval = self.nomval * other.nomval
-        stddev = abs(nomval) * m.sqrt((self.stddev / self.nomval)**2 + 
-                                      (other.stddev / other.nomval)**2 + 
-                                      2 * cov / nomval)
-        return ufloat(nomval, stddev)
+        rs = self.stddev / self.nomval                  # relative errors
+        ro = other.stddev / other.nomval
+        stddev = abs(nomval) * m.sqrt(rs*rs + ro*ro)    # + 2 * cov / nomval
+        return ufloat._raw(nomval, stddev)
         
         
     def __truediv__(self, other):
-        cov = self._covariance(other)
         nomval = self.nomval / other.nomval
-        stddev = abs(nomval) * m.sqrt((self.stddev / self.nomval)**2 + 
-                                      (other.stddev / other.nomval)**2 - 
-                                      2 * cov / (self.nomval * other.nomval))
-        return ufloat(nomval, stddev)
+        rs = self.stddev / self.nomval                  # relative errors
+        ro = other.stddev / other.nomval
+        stddev = abs(nomval) * m.sqrt(rs*rs + ro*ro)    # - 2 * cov / (self.nomval * other.nomval)
+        return ufloat._raw(nomval, stddev)
         
     
     # The nominal value of the function value is the function value at the location of the nominal 
@@ -131,36 +156,36 @@ class ufloat(object):
         if (abs(self)) >= 1:
             raise ValueError ("acos(x): |x| >= 1")
         nomval = m.acos(self.nomval)
-        stddev = - self.stddev / m.sqrt(1 - self.nomval**2) # acos'(x) = -1 / sqrt(1 - x²), |x| < 1
-        return ufloat(nomval, stddev)
+        stddev = - self.stddev / m.sqrt(1 - self.nomval*self.nomval) # acos'(x) = -1 / sqrt(1 - x²), |x| < 1
+        return ufloat._raw(nomval, stddev)
         
         
     def acosh(self):
         if (self) <= 1:
             raise ValueError ("acosh(x): x <= 1")
         nomval = m.acosh(self.nomval)
-        stddev = self.stddev / m.sqrt(self.nomval**2 - 1)   # acosh'(x) = 1 / sqrt(x² - 1), x > 1
-        return ufloat(nomval, stddev)
+        stddev = self.stddev / m.sqrt(self.nomval*self.nomval - 1)   # acosh'(x) = 1 / sqrt(x² - 1), x > 1
+        return ufloat._raw(nomval, stddev)
         
         
     def asin(self):
         if (abs(self)) >= 1:
             raise ValueError ("asin(x): |x| >= 1")
         nomval = m.asin(self.nomval)
-        stddev = self.stddev / m.sqrt(1 - self.nomval**2)   # asin'(x) = 1 / sqrt(1 - x²), |x| < 1
-        return ufloat(nomval, stddev)
+        stddev = self.stddev / m.sqrt(1 - self.nomval*self.nomval)   # asin'(x) = 1 / sqrt(1 - x²), |x| < 1
+        return ufloat._raw(nomval, stddev)
         
         
     def asinh(self):
         nomval = m.asinh(self.nomval)
-        stddev = self.stddev / m.sqrt(1 + self.nomval**2)   # asinh'(x) = 1 / sqrt(x² + 1) 
-        return ufloat(nomval, stddev)
+        stddev = self.stddev / m.sqrt(1 + self.nomval*self.nomval)   # asinh'(x) = 1 / sqrt(x² + 1) 
+        return ufloat._raw(nomval, stddev)
         
         
     def atan(self):
         nomval = m.atan(self.nomval)
-        stddev = self.stddev / (1 + self.nomval**2)         # atan'(x) = 1 / (x² + 1) 
-        return ufloat(nomval, stddev)
+        stddev = self.stddev / (1 + self.nomval*self.nomval)         # atan'(x) = 1 / (x² + 1) 
+        return ufloat._raw(nomval, stddev)
         
         
     def atan2(self, other):
@@ -169,17 +194,19 @@ class ufloat(object):
         y = self
         x = other
         nomval = m.atan2(y.nomval, x.nomval)
-        stddev = m.sqrt((y.stddev * ( x.nomval/(x.nomval**2 + y.nomval**2)))**2 + 
-                        (x.stddev * (-y.nomval/(x.nomval**2 + y.nomval**2)))**2) 
-        return ufloat(nomval, stddev)
+        inv = 1.0 / (x.nomval*x.nomval + y.nomval*y.nomval)
+        dy = y.stddev * x.nomval * inv
+        dx = x.stddev * y.nomval * inv
+        stddev = m.sqrt(dy*dy + dx*dx)
+        return ufloat._raw(nomval, stddev)
         
         
     def atanh(self):
         if (abs(self)) >= 1:
             raise ValueError ("atanh(x): |x| >= 1")
         nomval = m.atanh(self.nomval)
-        stddev = self.stddev / (1 - self.nomval**2)         # atanh'(x) = 1 / (1 - x²), |x| < 1
-        return ufloat(nomval, stddev)
+        stddev = self.stddev / (1 - self.nomval*self.nomval)         # atanh'(x) = 1 / (1 - x²), |x| < 1
+        return ufloat._raw(nomval, stddev)
 
 
     def _deriv_copysign(x, y):
@@ -193,50 +220,50 @@ class ufloat(object):
         #          lambda x, y: 0],
         nomval = m.copysign(self.nomval, other.nomval)
         stddev = self.stddev * self._deriv_copysign(other)  # + other.stddev * 0
-        return ufloat(nomval, stddev)
+        return ufloat._raw(nomval, stddev)
 
     
     def cos(self):
         nomval = m.cos(self.nomval)
-        stddev = - self.stddev * m.sqrt(1 - nomval**2)      # cos'(x) = -sin(x) = -sqrt(1 - cos²(x))
-        return ufloat(nomval, stddev)
+        stddev = - self.stddev * m.sin(self.nomval)             # cos'(x) = -sin(x)
+        return ufloat._raw(nomval, stddev)
         
         
     def cosh(self):
         nomval = m.cosh(self.nomval)
-        stddev = self.stddev * m.sqrt(1 + nomval**2)        # cosh'(x) = sinh(x) = sqrt(1 + cosh²(x))
-        return ufloat(nomval, stddev)
+        stddev = self.stddev * m.sinh(self.nomval)              # cosh'(x) = sinh(x)
+        return ufloat._raw(nomval, stddev)
         
     
     def degrees(self):
         nomval = m.degrees(self.nomval)
-        stddev = self.stddev * m.degrees(1)
-        return ufloat(nomval, stddev)
+        stddev = self.stddev * _DEG_PER_RAD
+        return ufloat._raw(nomval, stddev)
         
     deg = degrees
         
     def erf(self):
         nomval = m.erf(self.nomval)
-        stddev = self.stddev * m.exp(-self.nomval**2) * erf_coef    # erf'(x) = 2 / sqrt(pi) * exp(-x²)
-        return ufloat(nomval, stddev)
+        stddev = self.stddev * m.exp(-self.nomval*self.nomval) * erf_coef    # erf'(x) = 2 / sqrt(pi) * exp(-x²)
+        return ufloat._raw(nomval, stddev)
     
         
     def erfc(self):
         nomval = m.erfc(self.nomval)
-        stddev = - self.stddev * m.exp(-self.nomval**2) * erf_coef  # erfc'(x) = - 2 / sqrt(pi) * exp(-x²)
-        return ufloat(nomval, stddev)
+        stddev = - self.stddev * m.exp(-self.nomval*self.nomval) * erf_coef  # erfc'(x) = - 2 / sqrt(pi) * exp(-x²)
+        return ufloat._raw(nomval, stddev)
     
 
     def exp(self):
         nomval = m.exp(self.nomval)
         stddev = self.stddev * nomval                       # exp'(x) = exp(x)
-        return ufloat(nomval, stddev)
+        return ufloat._raw(nomval, stddev)
     
 
     def expm1(self):
         nomval = m.expm1(self.nomval)
         stddev = self.stddev * nomval                       # expm1'(x) = expm1(x)
-        return ufloat(nomval, stddev)
+        return ufloat._raw(nomval, stddev)
     
 
     def _deriv_fabs(x):
@@ -246,7 +273,7 @@ class ufloat(object):
     def fabs(self):
         nomval = m.fabs(self.nomval)
         stddev = self.stddev * _deriv_fabs(self.nomval)
-        return ufloat(nomval, stddev)
+        return ufloat._raw(nomval, stddev)
     
 
     def _psi(self):
@@ -256,9 +283,22 @@ class ufloat(object):
         psi(x) is also identical to H(x-1) - gamma (the Euler-Mascheroni constant), 
         with H(x-1) being the (x-1)st partial sum of the harmonic series, which in turn 
         can be approximated by using an asymptotic development with great precision (5). '''
-        x = self
-        return (m.log(x) + 1/(2*x) - 1/(12*x**2) + 1/(120*x**4) - 1/(252*x**6) + 1/(240*x**8) - 1/(132*x**10))
-        # TODO calculating it this way is not particularly efficient. 
+        # psi(x) = ln(x) - 1/(2x) - 1/(12x²) + 1/(120x⁴) - 1/(252x⁶) + 1/(240x⁸) - 1/(132x¹⁰)
+        # evaluated as a Horner polynomial in u = 1/x². The series is asymptotic, so small x 
+        # are first shifted up with psi(x) = psi(x+1) - 1/x. 
+        x = self.nomval
+        acc = 0.0
+        while x < 6.0:
+            acc -= 1.0 / x
+            x += 1.0
+        inv = 1.0 / x
+        u = inv * inv
+        p = _PSI_C5
+        p = _PSI_C4 - u * p
+        p = _PSI_C3 - u * p
+        p = _PSI_C2 - u * p
+        p = _PSI_C1 - u * p
+        return acc + m.log(x) - 0.5 * inv - u * p
 
 
     def gamma(self):
@@ -266,7 +306,7 @@ class ufloat(object):
         The derivative is gamma'(x) = gamma(x) * psi(x). '''
         nomval = m.gamma(self.nomval)
         stddev = self.stddev * nomval * self._psi()
-        return ufloat(nomval, stddev)
+        return ufloat._raw(nomval, stddev)
         # not that the gamma function played a big role in engineerial error propagation, but hey. 
                 
 
@@ -275,10 +315,11 @@ class ufloat(object):
         #       lambda x, y: y/math.hypot(x, y)],
         x = self
         y = other
-        nomval = m.sqrt(x.nomval*x.nomval + y.nomval*y.nomval)
-        stddev = m.sqrt((x.stddev * x.nomval / nomval)**2 + 
-                        (y.stddev * y.nomval / nomval)**2)
-        return ufloat(nomval, stddev)
+        nomval = _hypot(x.nomval, y.nomval)
+        dx = x.stddev * x.nomval
+        dy = y.stddev * y.nomval
+        stddev = m.sqrt(dx*dx + dy*dy) / nomval
+        return ufloat._raw(nomval, stddev)
                 
 
     def lgamma(self):
@@ -286,7 +327,7 @@ class ufloat(object):
         The derivative is lgamma'(x) = psi(x). '''
         nomval = m.gamma(self.nomval)
         stddev = self.stddev * self._psi()
-        return ufloat(nomval, stddev)
+        return ufloat._raw(nomval, stddev)
         # not that the lgamma function played a big role in engineerial error propagation, but hey. 
         
         
@@ -295,7 +336,7 @@ class ufloat(object):
             raise ValueError ("log(x): x <= 0")
         nomval = m.log(self.nomval)
         stddev = self.stddev / self.nomval                  # log'(x) = 1 / x
-        return ufloat(nomval, stddev)
+        return ufloat._raw(nomval, stddev)
 
     ln = log
 
@@ -303,8 +344,8 @@ class ufloat(object):
         if (self) <= 0:
             raise ValueError ("log(x): x <= 0")
         nomval = m.log10(self.nomval)
-        stddev = self.stddev / self.nomval / m.log(10.0)
-        return ufloat(nomval, stddev)
+        stddev = self.stddev / (self.nomval * _LN10)
+        return ufloat._raw(nomval, stddev)
 
     lg = log10                                      # which is what we used in the old days - bear with me.
 
@@ -312,41 +353,43 @@ class ufloat(object):
         if (self) <= 0:
             raise ValueError ("log(x): x <= 0")
         nomval = m.log2(self.nomval)
-        stddev = self.stddev / self.nomval / m.log(2.0)
-        return ufloat(nomval, stddev)
+        stddev = self.stddev / (self.nomval * _LN2)
+        return ufloat._raw(nomval, stddev)
 
 
     def __pow__(self, other):
         # (1) f = A**B
         if isinstance (other, (int, float)):
-            # (1) f = a * A ** b
-            other = ufloat(other, 0.0)              # saves us another code path -> more compact
-        cov = self._covariance(other)
+            # (1) f = a * A ** b, the B term is 0 so we need no log(A). 
+            nomval = self.nomval ** other
+            if self.nomval == 0:                    # no division by A, take the derivative b * A**(b-1) as is
+                return ufloat._raw(nomval, abs(other * self.nomval ** (other - 1) * self.stddev))
+            stddev = abs(nomval * other * self.stddev / self.nomval)
+            return ufloat._raw(nomval, stddev)
         nomval = self.nomval ** other.nomval
-        stddev = abs(nomval) * m.sqrt((other.nomval * self.stddev / self.nomval)**2 + 
-                                      (m.log(self.nomval) * other.stddev)**2 + 
-                                      (2 * other.nomval * m.log(self.nomval) * cov / self.nomval)
-                                     )
-        return ufloat(nomval, stddev)
+        da = other.nomval * self.stddev / self.nomval
+        db = m.log(self.nomval) * other.stddev
+        stddev = abs(nomval) * m.sqrt(da*da + db*db)    # + 2 * other.nomval * log(self.nomval) * cov / self.nomval
+        return ufloat._raw(nomval, stddev)
 
         
     def radians(self):
         nomval = m.radians(self.nomval)
-        stddev = self.stddev * m.radians(1)
-        return ufloat(nomval, stddev)
+        stddev = self.stddev * _RAD_PER_DEG
+        return ufloat._raw(nomval, stddev)
                 
     rad = radians
        
     def sin(self):
         nomval = m.sin(self.nomval)
-        stddev = self.stddev * m.sqrt(1 - nomval**2)        # sin'(x) = cos(x) = sqrt(1 - sin²(x))
-        return ufloat(nomval, stddev)
+        stddev = self.stddev * m.cos(self.nomval)               # sin'(x) = cos(x)
+        return ufloat._raw(nomval, stddev)
         
         
     def sinh(self):
         nomval = m.sinh(self.nomval)
-        stddev = self.stddev * m.sqrt(1 + nomval**2)        # sinh'(x) = cosh(x) = sqrt(1 + sinh²(x))
-        return ufloat(nomval, stddev)
+        stddev = self.stddev * m.cosh(self.nomval)              # sinh'(x) = cosh(x)
+        return ufloat._raw(nomval, stddev)
         
 
     def sqrt(self):
@@ -355,20 +398,20 @@ class ufloat(object):
         if (self) <= 0:
             raise ValueError ("sqrt(x): x <= 0")
         nomval = m.sqrt(self.nomval)
-        stddev = self.stddev * 0.5 / nomval                 # sqrt'(x) = 0.5 / sqrt(x) but we want to calculate sqrt(x) only once. 
-        return ufloat(nomval, stddev)
+        stddev = 0.5 * self.stddev / nomval                 # sqrt'(x) = 0.5 / sqrt(x) but we want to calculate sqrt(x) only once. 
+        return ufloat._raw(nomval, stddev)
 
         
     def tan(self):
         nomval = m.tan(self.nomval)
-        stddev = self.stddev * (1 + nomval**2)              # tan'(x) = 1 + tan²(x) but we want to calculate tan(x) only once. 
-        return ufloat(nomval, stddev)
+        stddev = self.stddev * (1 + nomval*nomval)              # tan'(x) = 1 + tan²(x) but we want to calculate tan(x) only once. 
+        return ufloat._raw(nomval, stddev)
         
         
     def tanh(self):
         nomval = m.tanh(self.nomval)
-        stddev = self.stddev * (1 - nomval**2)              # tanh'(x) = 1 - tanh²(x) but we want to calculate tanh(x) only once. 
-        return ufloat(nomval, stddev)
+        stddev = self.stddev * (1 - nomval*nomval)              # tanh'(x) = 1 - tanh²(x) but we want to calculate tanh(x) only once. 
+        return ufloat._raw(nomval, stddev)
 
         
 
@@ -24,9 +24,21 @@ done
 cd .. 
 patch -p1 < ../circuitpython-$VER.diff 
 
+# freeze the calculator's modules into the Feather M4 image, so that their bytecode runs 
+# from flash instead of being compiled into RAM on every boot. code.py must stay a source file. 
+FROZEN="keymap.py umath.py uncertainty.py ufractions.py bbq10keyboard.py"
+mkdir -p frozen/calculator
+for i in $FROZEN ; do 
+	cp ../CIRCUITPY/$i frozen/calculator/
+done
+echo 'FROZEN_MPY_DIRS += $(TOP)/frozen/calculator' >> ports/atmel-samd/boards/feather_m4_express/mpconfigboard.mk
+
 echo "
 Prep finished. 
 
+The Feather M4 image contains $FROZEN as frozen modules. 
+Delete them from CIRCUITPY after flashing, since files on the drive take precedence. 
+
 Now you can go to the desired ports directory and build the image for your board, e.g. 
 
 cd circuitpython/ports/atmel-samd/
@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: 2024 Harald Milz <hm@seneca.muc.de> (https://github.com/h-milz/circuitpython-calculator)
+#
+# SPDX-License-Identifier: MIT
+
+# Host-side reference for CIRCUITPY/benchmark.py. Runs on a PC with CPython and numba,
+# not on the board: python3 host_benchmark.py
+#
+# The float loop is compiled with numba so that we get an LLVM-backed number to compare
+# the CircuitPython results against. The integer benchmark computes 1000! which does not
+# fit into 64 bits, and numba has no bignums, so it runs in plain CPython, just like the
+# list benchmark.
+
+import math as m
+import random
+import time
+from numba import njit
+
+
+@njit(cache=True)         # njit implies nopython mode, i.e. no silent object-mode fallback
+def float_bench(n, x):
+    # accumulate the results, otherwise LLVM throws away the whole loop.
+    acc = 0.0
+    for i in range(n):
+        acc += m.sin(x) + m.cos(x) + m.sqrt(x)
+    return acc
+
+
+def int_bench(n):
+    for i in range(n):
+        res = m.factorial(1000)
+    return res
+
+
+def list_bench(n, table1):
+    for j in range(n):
+        table2 = sorted(table1)
+    return table2
+
+
+# same loop counts as on the board.
+
+n = 100000
+print ("Integer: elapsed time = ", end="")
+start = time.monotonic()
+int_bench(n)
+elapsed = time.monotonic() - start
+print ("{:.2f} s".format(elapsed))
+
+x = m.sqrt(m.pi) # this is our "random" value
+n = 100000
+float_bench(1, x)               # compile (or load from cache) outside the timed region
+print ("Float:   elapsed time = ", end="")
+start = time.monotonic()
+float_bench(n, x)
+elapsed = time.monotonic() - start
+print ("{:.2f} s".format(elapsed))
+
+table1 = []
+n = 1200
+random.seed(12345) # constant seed so that random values are deterministic.
+tablen = 1000
+for i in range (tablen):
+    table1.append(random.randint(0, 1000000))
+print ("List:    elapsed time = ", end="")
+start = time.monotonic()
+list_bench(n, table1)
+elapsed = time.monotonic() - start
+print ("{:.2f} s".format(elapsed))